@@ -0,0 +1,212 @@
+"""
+Copyright 2023 NovAtel Inc.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Module Description: Measures the import and startup costs of EDIE and reports them as JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from novatel_edie.common import JSON_DB_PATH
+
+
+def _resident_memory() -> dict:
+    """Gets the current and peak resident memory of this process in bytes, where the platform reports them.
+    """
+    memory = {'rss': None, 'peak_rss': None}
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            memory['rss'] = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        memory['peak_rss'] = peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+    except ImportError:
+        pass
+    return memory
+
+
+# Times importing the decoder modules. It runs with python -c rather than through this module, which would import
+# novatel_edie and novatel_edie.common before the timer starts.
+_IMPORT_SCRIPT = """
+import json
+import time
+start = time.perf_counter()
+import novatel_edie.decoders.novatel
+import novatel_edie.interfaces.file_stream
+elapsed = time.perf_counter() - start
+from novatel_edie.benchmark_startup import _resident_memory
+print(json.dumps({'import': elapsed, **_resident_memory()}))
+"""
+
+
+def _measure_json_reader(json_db_filepath: str, cache_dir: str = None) -> dict:
+    """Times constructing a JsonReader and loading both of its sides.
+    """
+    from novatel_edie.decoders import jsonreader
+
+    results = dict()
+    start = time.perf_counter()
+    json_db = jsonreader.JsonReader(json_db_filepath, cache=cache_dir or False)
+    results['construct'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    json_db.get_dll_reference()
+    results['load_native'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    _ = json_db.message_definitions
+    results['load_definitions'] = time.perf_counter() - start
+
+    # The native library and definitions are already loaded, so this only generates the ctypes structures.
+    start = time.perf_counter()
+    json_db.preload()
+    results['generate_structures'] = time.perf_counter() - start
+
+    results.update(_resident_memory())
+    return results
+
+
+def _measure_json_reader_cached(json_db_filepath: str) -> dict:
+    """Times constructing a JsonReader from a warm compiled definitions cache.
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        from novatel_edie.decoders import jsonreader
+        _ = jsonreader.JsonReader(json_db_filepath, cache=cache_dir).message_definitions
+        return _measure_json_reader(json_db_filepath, cache_dir)
+
+
+def _measure_components(json_db_filepath: str) -> dict:
+    """Times initializing each component with a shared, already loaded JsonReader.
+    """
+    from novatel_edie.decoders import jsonreader, novatel
+
+    json_db = jsonreader.JsonReader(json_db_filepath)
+    json_db.get_dll_reference()
+    components = {
+        'Framer': novatel.Framer,
+        'Filter': novatel.Filter,
+        'HeaderDecoder': lambda: novatel.HeaderDecoder(json_db),
+        'MessageDecoder': lambda: novatel.MessageDecoder(json_db),
+        'Encoder': lambda: novatel.Encoder(json_db),
+        'Parser': lambda: novatel.Parser(json_db),
+        'Commander': lambda: novatel.Commander(json_db),
+    }
+
+    results = dict()
+    instances = list()
+    for name, component in components.items():
+        start = time.perf_counter()
+        instances.append(component())
+        results[name] = time.perf_counter() - start
+    results.update(_resident_memory())
+    return results
+
+
+MEASUREMENTS = {
+    'json_reader': _measure_json_reader,
+    'json_reader_cached': _measure_json_reader_cached,
+    'components': _measure_components,
+}
+
+
+def _run_measurement(name: str, json_db_filepath: str, cold: bool = False) -> dict:
+    """Runs one measurement in a fresh interpreter.
+
+    Args:
+        name: 'import' or the key of the measurement in MEASUREMENTS.
+        json_db_filepath: JSON database to load.
+        cold: Compile the modules from source instead of using their cached bytecode.
+    """
+    command = [sys.executable]
+    with tempfile.TemporaryDirectory() as pycache_prefix:
+        if cold:
+            command += ['-X', f'pycache_prefix={pycache_prefix}']
+        if name == 'import':
+            command += ['-c', _IMPORT_SCRIPT]
+        else:
+            command += ['-m', 'novatel_edie.benchmark_startup', '--measure', name, '--json_database',
+                        json_db_filepath]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def _summarize(runs: list) -> dict:
+    """Reduces repeated runs to the minimum and median of each metric.
+    """
+    summary = dict()
+    for metric in runs[0]:
+        values = [run[metric] for run in runs if run[metric] is not None]
+        summary[metric] = {'min': min(values), 'median': statistics.median(values)} if values else None
+    return summary
+
+
+def run_benchmarks(json_db_filepath: str = JSON_DB_PATH, repeat: int = 5) -> dict:
+    """Runs every startup measurement, each in fresh interpreters.
+
+    Args:
+        json_db_filepath: JSON database to load.
+        repeat: Number of runs of each measurement.
+
+    Returns:
+        Dict of the environment and, per measurement, the minimum and median of each metric. Times are in seconds
+        and memory in bytes.
+    """
+    results = {
+        'import_cold': _summarize([_run_measurement('import', json_db_filepath, cold=True) for _ in range(repeat)]),
+        'import': _summarize([_run_measurement('import', json_db_filepath) for _ in range(repeat)]),
+    }
+    for name in MEASUREMENTS:
+        results[name] = _summarize([_run_measurement(name, json_db_filepath) for _ in range(repeat)])
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'json_db': json_db_filepath,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main():
+    """Main function to benchmark the startup costs of EDIE.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-jdb", "--json_database", type=str,
+                        help="Path to the JSON UI database containing message definitions",
+                        default=JSON_DB_PATH)
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Number of runs of each measurement")
+    parser.add_argument("-o", "--output", type=str, help="File to write the JSON report to instead of stdout")
+    parser.add_argument("--measure", choices=MEASUREMENTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        # Child process of _run_measurement.
+        print(json.dumps(MEASUREMENTS[args.measure](args.json_database)))
+        return
+
+    report = json.dumps(run_benchmarks(args.json_database, args.repeat), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
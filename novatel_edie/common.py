@@ -10,7 +10,9 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 Module Description: Holds common data structures and functions across EDIE's interface and decoders.
 """
 import os
-
+import sys
+import threading
+from ctypes import CDLL, cdll
 from enum import Enum
 
 
@@ -29,3 +31,77 @@ class LogLevelEnum(Enum):
 
 RESOURCES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources')
 JSON_DB_PATH = os.path.join(RESOURCES_PATH, 'messages_public.json')
+CACHE_PATH = os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'novatel_edie')
+
+
+class NativeLibrary:
+    """Native EDIE library that is loaded on first use.
+
+    Modules declare the prototypes of the functions they use as a table, which is applied when the library is
+    loaded, so importing them does not load the library. Functions are looked up as attributes, like on a CDLL.
+    """
+
+    def __init__(self, linux_name: str, win32_name: str):
+        """Initializer.
+
+        Args:
+            linux_name: File name of the library on Linux, in the resources directory.
+            win32_name: File name of the library on Windows, in the resources directory.
+        """
+        self._names = {'linux': linux_name, 'win32': win32_name}
+        self._library = None
+        self._prototypes = dict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        function = getattr(self.load(), name)
+        # Cache the function so later lookups do not go through __getattr__.
+        setattr(self, name, function)
+        return function
+
+    @property
+    def path(self) -> str:
+        """Path of the library on this platform.
+        """
+        if sys.platform not in self._names:
+            raise OSError(f'Unsupported platform: {sys.platform}')
+        return os.path.abspath(os.path.join(RESOURCES_PATH, self._names[sys.platform]))
+
+    @property
+    def loaded(self) -> bool:
+        return self._library is not None
+
+    def declare(self, prototypes: dict):
+        """Declares function prototypes.
+
+        Args:
+            prototypes: Dict of function name to a (restype, argtypes) tuple.
+        """
+        with self._lock:
+            self._prototypes.update(prototypes)
+            if self._library is not None:
+                self._apply(prototypes)
+
+    def load(self) -> CDLL:
+        """Loads the library and applies the declared prototypes, if not done already.
+
+        Returns:
+            The loaded library.
+        """
+        if self._library is None:
+            with self._lock:
+                if self._library is None:
+                    library = cdll.LoadLibrary(self.path) if sys.platform == 'linux' else CDLL(self.path)
+                    self._library = library
+                    self._apply(self._prototypes)
+        return self._library
+
+    def _apply(self, prototypes: dict):
+        for name, (restype, argtypes) in prototypes.items():
+            function = getattr(self._library, name)
+            function.restype = restype
+            function.argtypes = argtypes
@@ -10,24 +10,22 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 Module Description: Holds common data structures and functions for EDIE's decoders.
 """
 import copy
-import os
-import sys
+import csv
+import struct
 from ctypes import *
 from enum import Enum
+from typing import Iterable, Iterator
 
-DECODERS_DLL = None
-if sys.platform == 'linux':
-    DECODERS_DLL = cdll.LoadLibrary(os.path.abspath(os.path.join(
-        os.path.dirname(__file__), '../resources', 'libdecoders_dynamic_library.so')))
-elif sys.platform == 'win32':
-    DECODERS_DLL = CDLL(os.path.abspath(os.path.join(
-        os.path.dirname(__file__), '../resources', 'decoders_dynamic_library.dll')))
+from novatel_edie.common import NativeLibrary
 
-# Version
-DECODERS_DLL.version.restype = c_char_p
-DECODERS_DLL.version.argtypes = None
-DECODERS_DLL.pretty_version.restype = c_char_p
-DECODERS_DLL.pretty_version.argtypes = None
+# Loaded on first use, see NativeLibrary.
+DECODERS_DLL = NativeLibrary('libdecoders_dynamic_library.so', 'decoders_dynamic_library.dll')
+
+DECODERS_DLL.declare({
+    # Version
+    'version': (c_char_p, None),
+    'pretty_version': (c_char_p, None),
+})
 
 # Constants
 MESSAGE_SIZE_MAX = 32768
@@ -36,6 +34,7 @@ MAX_BINARY_MESSAGE_LENGTH = MESSAGE_SIZE_MAX
 MAX_SHORT_ASCII_MESSAGE_LENGTH = MESSAGE_SIZE_MAX
 MAX_SHORT_BINARY_MESSAGE_LENGTH = 12 + 255 + 4  # (OEM4_SHORT_BINARY_HEADER_LENGTH + 0xFF + OEM4_BINARY_CRC_LENGTH)
 MAX_ABB_ASCII_RESPONSE_LENGTH = MESSAGE_SIZE_MAX
+MILLISECONDS_IN_WEEK = 7 * 24 * 60 * 60 * 1000
 # NovAtel Docs - NMEA Standard Logs: Explicitly states that the maximum allowable is 82 chars.
 # NOTE: Numerous internal logs break that standard, so we will use 256 here as a safety measure.
 NMEA_SYNC = '$'
@@ -67,6 +66,59 @@ OEM4_SHORT_BINARY_HEADER_LENGTH = 12
 OEM4_ENCRYPTED_BINARY_SYNC2 = 0x45
 
 
+def to_c_char_buffer(data):
+    """Prepares a bytes-like object to be passed as a c_char_p argument.
+
+    bytes are passed through untouched. Writable buffers such as the memoryviews returned by a zero-copy Framer are
+    wrapped in place so no copy is made; read-only buffers are copied.
+
+    Args:
+        data: bytes, bytearray or memoryview.
+
+    Returns:
+        An object accepted by ctypes for a c_char_p argument.
+    """
+    if isinstance(data, bytes):
+        return data
+    view = memoryview(data)
+    if view.readonly:
+        return view.tobytes()
+    return (c_char * view.nbytes).from_buffer(view)
+
+
+def ctype_to_dtype(ctype) -> 'numpy.dtype':
+    """Builds a NumPy dtype with exactly the memory layout of a ctypes type. Requires NumPy.
+
+    Structures keep their field offsets, padding and total size (including _pack_), char arrays become fixed-length
+    byte strings and other arrays become sub-array dtypes. Pointers are represented as unsigned integers.
+
+    Args:
+        ctype: ctypes type to convert.
+
+    Returns:
+        The equivalent NumPy dtype.
+    """
+    import numpy as np
+
+    if issubclass(ctype, Structure):
+        names = [name for name, _ in ctype._fields_]
+        return np.dtype({
+            'names': names,
+            'formats': [ctype_to_dtype(field_type) for _, field_type in ctype._fields_],
+            'offsets': [getattr(ctype, name).offset for name in names],
+            'itemsize': sizeof(ctype)
+        })
+    if issubclass(ctype, Array):
+        if ctype._type_ is c_char:
+            return np.dtype(f'S{ctype._length_}')
+        return np.dtype((ctype_to_dtype(ctype._type_), (ctype._length_,)))
+    if ctype is c_char:
+        return np.dtype('S1')
+    if issubclass(ctype, (c_char_p, c_void_p)):
+        return np.dtype(np.uintp)
+    return np.dtype(ctype)
+
+
 class STATUS(Enum):
     """Enumeration for status codes returned from EDIE components.
     """
@@ -127,6 +179,14 @@ class StructureOutput(Structure):
     """Parent class defining __str__ and __repr__ methods.
     """
 
+    def snapshot(self):
+        """Creates an owned copy of the structure.
+
+        Use this to keep a structure that a component recycles between reads. Pointer fields are copied as-is and
+        still reference the component's buffers.
+        """
+        return type(self).from_buffer_copy(self)
+
     def __str__(self):
         return ''.join([f'{name}: {getattr(self, name)}\n' for name, val in self._fields_])
 
@@ -145,25 +205,54 @@ class BaseStructMixin:
 
     def _fields_to_list(self) -> list:
         message_values = []
-        fields = enumerate(self._fields_)
-
-        for idx, (field_name, field_type) in fields:
-            if hasattr(field_type, '_length_') and field_type._type_ != c_char:
-                for i in range(getattr(field_type, '_length_')):
-                    message_values.append(getattr(self, field_name)[i])
+        plan = type(self).__dict__.get('_fields_to_list_plan_')
+        if plan is None:
+            plan = _fields_to_list_plan(type(self))
+
+        for field_name, step in plan:
+            if step is _ARRAY:
+                message_values.extend(getattr(self, field_name)[:])
+            elif step is _LENGTH_ARRAY:
+                # field_name is (array field, count field). The count field was listed just before.
+                message_values.extend(getattr(self, field_name[0])[:getattr(self, field_name[1])])
+            elif step is _COUNTED_ARRAY:
+                # field_name is (count field, array field).
+                array_len = getattr(self, field_name[0])
+                message_values.append(array_len)
+                message_values.extend(getattr(self, field_name[1])[:array_len])
             else:
                 message_values.append(getattr(self, field_name))
 
-                if field_name.endswith('_arraylength'):
-                    array_len = getattr(self, field_name)
-                    array_idx, (array_name, array_type) = next(fields)
-                    array = getattr(self, array_name)
-                    for i in range(array_len):
-                        message_values.append(array[i])
-
         return message_values
 
 
+_VALUE, _ARRAY, _LENGTH_ARRAY, _COUNTED_ARRAY = 'value', 'array', 'length_array', 'counted_array'
+
+
+def _fields_to_list_plan(structure_type: type) -> list:
+    """Compiles the steps of BaseStructMixin._fields_to_list for a structure type and stores them on the type.
+
+    Arrays other than char arrays are listed element by element. An array with a _length field, or following an
+    _arraylength field, is constrained to that length, like in StructureFlattener.
+    """
+    plan = []
+    field_names = {field_name for field_name, _ in structure_type._fields_}
+    fields = iter(structure_type._fields_)
+    for field_name, field_type in fields:
+        if hasattr(field_type, '_length_') and field_type._type_ != c_char:
+            if f'{field_name}_length' in field_names:
+                plan.append(((field_name, f'{field_name}_length'), _LENGTH_ARRAY))
+            else:
+                plan.append((field_name, _ARRAY))
+        elif field_name.endswith('_arraylength'):
+            array_name, _ = next(fields)
+            plan.append(((field_name, array_name), _COUNTED_ARRAY))
+        else:
+            plan.append((field_name, _VALUE))
+    setattr(structure_type, '_fields_to_list_plan_', plan)
+    return plan
+
+
 class SatelliteId(Structure, BaseStructMixin):
     _fields_ = [
         ("usPrnOrSlot", c_uint16),
@@ -171,6 +260,172 @@ class SatelliteId(Structure, BaseStructMixin):
     ]
 
 
+# struct format characters of the simple ctypes types, by kind and size.
+_STRUCT_INTEGER_CODES = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+_STRUCT_FLOAT_CODES = {4: 'f', 8: 'd'}
+
+
+def _struct_format(ctype) -> tuple:
+    """Builds the little-endian struct format of a ctypes type.
+
+    Args:
+        ctype: ctypes type to convert.
+
+    Returns:
+        Tuple of the format, the number of values it unpacks to and the positions of the char array values among
+        them.
+    """
+    if issubclass(ctype, Structure):
+        format_string, count, strings, position = '', 0, [], 0
+        for field_name, field_type in ctype._fields_:
+            offset = getattr(ctype, field_name).offset
+            if offset > position:
+                format_string += f'{offset - position}x'
+            field_format, field_count, field_strings = _struct_format(field_type)
+            format_string += field_format
+            strings += [count + index for index in field_strings]
+            count += field_count
+            position = offset + sizeof(field_type)
+        if sizeof(ctype) > position:
+            format_string += f'{sizeof(ctype) - position}x'
+        return format_string, count, strings
+    if issubclass(ctype, Array):
+        if ctype._type_ is c_char:
+            return f'{ctype._length_}s', 1, [0]
+        element_format, element_count, element_strings = _struct_format(ctype._type_)
+        return (element_format * ctype._length_, element_count * ctype._length_,
+                [element * element_count + index for element in range(ctype._length_) for index in element_strings])
+
+    code = ctype._type_
+    if code in 'bBhHiIlLqQ':
+        integer_code = _STRUCT_INTEGER_CODES[sizeof(ctype)]
+        return (integer_code if code.islower() else integer_code.upper()), 1, []
+    if code in 'fdg' and sizeof(ctype) in _STRUCT_FLOAT_CODES:
+        return _STRUCT_FLOAT_CODES[sizeof(ctype)], 1, []
+    if code == '?':
+        return '?', 1, []
+    if code == 'c':
+        return 'c', 1, []
+    if code in 'zPO':
+        return ('Q' if sizeof(ctype) == 8 else 'I'), 1, []
+    raise ValueError(f'Unsupported ctypes type: {ctype.__name__}')
+
+
+class StructureFlattener:
+    """Flattens many structures of one type into rows or columns.
+
+    The field plan of the structure type is compiled once into a struct format, so flattening a structure is a
+    single unpack of its memory. Rows list every leaf value in field order, with the elements of nested structures
+    flattened in place. Arrays with a _length (or _arraylength) count field only contribute the elements in use,
+    and char arrays are cut at their first NUL like ctypes does.
+    """
+
+    def __init__(self, structure_type: type):
+        """Initializer.
+
+        Args:
+            structure_type: ctypes structure type, e.g. from JsonReader.get_message_definition_structure.
+        """
+        self.structure_type = structure_type
+        format_string, _, strings = _struct_format(structure_type)
+        self._struct = struct.Struct('<' + format_string)
+        self._strings = strings
+
+        # Segments of the unpacked values making up a row: (start, values per element, elements, count position).
+        # A count position of None means every element is used.
+        field_names = {field_name for field_name, _ in structure_type._fields_}
+        field_positions = dict()
+        self._segments = []
+        position = 0
+        for field_name, field_type in structure_type._fields_:
+            _, field_count, _ = _struct_format(field_type)
+            field_positions[field_name] = position
+            if issubclass(field_type, Array) and field_type._type_ is not c_char:
+                count_name = next((name for name in (f'{field_name}_length', f'{field_name}_arraylength')
+                                   if name in field_names), None)
+                self._segments.append((position, field_count // field_type._length_, field_type._length_,
+                                       field_positions.get(count_name)))
+            else:
+                self._segments.append((position, field_count, 1, None))
+            position += field_count
+
+    def row(self, structure) -> list:
+        """Flattens a structure.
+
+        Args:
+            structure: Instance of the structure type, or any buffer holding one.
+
+        Returns:
+            The leaf values of the structure.
+        """
+        values = self._struct.unpack_from(structure)
+        return self._row(values)
+
+    def _row(self, values: tuple) -> list:
+        if self._strings:
+            values = list(values)
+            for index in self._strings:
+                values[index] = values[index].split(b'\0', 1)[0]
+
+        row = []
+        for start, element_count, elements, count_position in self._segments:
+            if count_position is not None:
+                elements = min(values[count_position], elements)
+            row.extend(values[start:start + element_count * elements])
+        return row
+
+    def rows(self, structures: Iterable) -> Iterator[list]:
+        """Flattens many structures.
+
+        Args:
+            structures: Instances of the structure type, or buffers holding one each. A single buffer holding
+                consecutive structures, such as a NumPy array with the structure's dtype, can be passed instead.
+
+        Yields:
+            The leaf values of each structure.
+        """
+        if hasattr(structures, '__array_interface__'):
+            import numpy as np
+
+            # Columns of larger arrays, like the body of a read_batch result, are strided views.
+            structures = np.ascontiguousarray(structures)
+        if isinstance(structures, (bytes, bytearray, memoryview)) or hasattr(structures, '__array_interface__'):
+            for values in self._struct.iter_unpack(memoryview(structures).cast('B')):
+                yield self._row(values)
+            return
+
+        for structure in structures:
+            yield self._row(self._struct.unpack_from(structure))
+
+    def columns(self, structures: Iterable) -> dict:
+        """Copies many structures into NumPy columns, one per top-level field. Requires NumPy.
+
+        Array fields become two-dimensional columns holding every element. Use their count column to tell which
+        elements are in use.
+
+        Args:
+            structures: Instances of the structure type.
+
+        Returns:
+            Dict of field name to NumPy array.
+        """
+        import numpy as np
+
+        view = np.frombuffer(b''.join(bytes(structure) for structure in structures),
+                             dtype=ctype_to_dtype(self.structure_type))
+        return {field_name: view[field_name] for field_name, _ in self.structure_type._fields_}
+
+    def write_csv(self, structures: Iterable, output_file, **fmtparams):
+        """Writes many structures as CSV rows.
+
+        Args:
+            structures: Instances of the structure type.
+            output_file: Text file to write to, opened with newline=''.
+            fmtparams: Formatting parameters for csv.writer.
+        """
+        csv.writer(output_file, **fmtparams).writerows(self.rows(structures))
+
+
 class HeaderFormatEnum(Enum):
     """Log format enum.
     """
@@ -187,6 +442,9 @@ class HeaderFormatEnum(Enum):
     ALL = 11
 
 
+_HEADER_FORMAT_UNKNOWN = HeaderFormatEnum.UNKNOWN.value
+
+
 class MetaDataStruct(StructureOutput):
     """MetaData structure
     """
@@ -208,7 +466,7 @@ class MetaDataStruct(StructureOutput):
 
     def __init__(self):
         super().__init__()
-        self.format = HeaderFormatEnum.UNKNOWN.value
+        self.format = _HEADER_FORMAT_UNKNOWN
 
 
 class MessageDataStruct(StructureOutput):
@@ -240,6 +498,38 @@ class MessageDataStruct(StructureOutput):
 
         return cpy
 
+    def detach(self) -> 'MessageDataStruct':
+        """Copies the structure and the data it points to into memory it owns.
+
+        The header and body pointers of the copy are remapped into its own copy of the message where they point
+        into the message, which is the case for every encode format, so this takes a single memmove.
+
+        Returns:
+            The detached structure.
+        """
+        cpy = type(self).from_buffer_copy(self)
+        cpy._buffers = []
+        message_start = self._message
+        message_end = message_start + self.message_length if message_start is not None else None
+        if message_start is not None:
+            buffer = create_string_buffer(self.message_length)
+            memmove(buffer, message_start, self.message_length)
+            cpy._buffers.append(buffer)
+            cpy._message = addressof(buffer)
+
+        for address_name, length_name in (('_header', 'header_length'), ('_body', 'body_length')):
+            address, length = getattr(self, address_name), getattr(self, length_name)
+            if address is None:
+                continue
+            if message_start is not None and message_start <= address and address + length <= message_end:
+                setattr(cpy, address_name, cpy._message + address - message_start)
+            else:
+                buffer = create_string_buffer(length)
+                memmove(buffer, address, length)
+                cpy._buffers.append(buffer)
+                setattr(cpy, address_name, addressof(buffer))
+        return cpy
+
     @property
     def message(self):
         if self._message is not None:
@@ -0,0 +1,236 @@
+"""
+Copyright 2023 NovAtel Inc.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Module Description: Holds classes and functions for indexing the frames of a file for random access.
+"""
+import os
+from ctypes import *
+from typing import Iterable, Union
+
+from novatel_edie.decoders import common, jsonreader, novatel
+
+FRAME_INDEX_MAGIC = b'EDIEIDX'
+FRAME_INDEX_VERSION = 1
+FRAME_INDEX_EXTENSION = '.edieidx'
+
+
+class FrameIndexEntry(common.StructureOutput):
+    """Location and header summary of one frame in a file.
+    """
+    _pack_ = 1
+    _fields_ = [
+        ('offset', c_uint64),  # Byte offset of the frame in the file.
+        ('length', c_uint32),  # The length of the frame.
+        ('format', c_uint8),  # The HeaderFormatEnum value of the frame.
+        ('time_status', c_uint8),  # The GPSTimeStatus of the message.
+        ('message_id', c_uint16),  # The message ID.
+        ('message_crc', c_uint32),  # The message definition CRC.
+        ('week', c_uint16),  # The GPS Week No.
+        ('milliseconds', c_double),  # The GPS Milliseconds.
+    ]
+
+
+class FrameIndexHeader(Structure):
+    """Header of a frame index file.
+    """
+    _pack_ = 1
+    _fields_ = [
+        ('magic', c_char * 8),
+        ('version', c_uint32),
+        ('entry_size', c_uint32),
+        ('source_size', c_uint64),  # Size of the indexed file, used to detect a stale index.
+        ('source_mtime_ns', c_uint64),  # Modification time of the indexed file, used to detect a stale index.
+        ('count', c_uint64),  # Number of entries following the header.
+    ]
+
+
+class FrameIndex:
+    """Index of the frames of a file.
+
+    The index records the offset, length, format, message ID and CRC, GPS time and time status of every frame that
+    was framed successfully. Frames whose header cannot be decoded, such as NMEA sentences, are indexed with a zero
+    message ID, CRC and time and an UNKNOWN time status. The index is stored in a compact binary sidecar file next to
+    the data so that repeated queries can seek straight to the frames they need with MappedFileParser.select_frames().
+    """
+
+    def __init__(self, entries, source_size: int = 0, source_mtime_ns: int = 0):
+        """Initializer.
+
+        Args:
+            entries: ctypes array of FrameIndexEntry.
+            source_size: Size of the indexed file.
+            source_mtime_ns: Modification time of the indexed file.
+        """
+        self.entries = entries
+        self.source_size = source_size
+        self.source_mtime_ns = source_mtime_ns
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, idx):
+        return self.entries[idx]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    @staticmethod
+    def default_path(input_file: str) -> str:
+        """Gets the path of the sidecar index file of a data file.
+        """
+        return input_file + FRAME_INDEX_EXTENSION
+
+    @classmethod
+    def build(cls, input_file: str, json_db: Union[str, jsonreader.JsonReader] = None) -> 'FrameIndex':
+        """Frames a file and indexes every frame.
+
+        Args:
+            input_file: File to index.
+            json_db: JSON database path or JsonReader used to decode the headers.
+
+        Returns:
+            The index of the file.
+        """
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f'File does not exist: {input_file}')
+        json_db = jsonreader.get_json_reader(json_db)
+
+        stat = os.stat(input_file)
+        header_decoder = novatel.HeaderDecoder(json_db)
+        entries = bytearray()
+
+        for offset, status, frame, meta_data in novatel.iter_file_frames(input_file):
+            if status != common.STATUS.SUCCESS:
+                continue
+            if header_decoder.decode(frame, meta_data)[0] == common.STATUS.SUCCESS:
+                entry = FrameIndexEntry(offset, meta_data.length, meta_data.format, meta_data.time_status,
+                                        meta_data.message_id, meta_data.message_crc, meta_data.week,
+                                        meta_data.milliseconds)
+            else:
+                # meta_data is reused from frame to frame, so its message fields still describe the previous one.
+                entry = FrameIndexEntry(offset, meta_data.length, meta_data.format, common.TIME_STATUS.UNKNOWN.value)
+            entries += bytes(entry)
+
+        count = len(entries) // sizeof(FrameIndexEntry)
+        return cls((FrameIndexEntry * count).from_buffer(entries), stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, index_file: str) -> 'FrameIndex':
+        """Loads an index from its sidecar file.
+
+        Args:
+            index_file: Path of the index file.
+
+        Returns:
+            The loaded index.
+        """
+        with open(index_file, 'rb') as input_file:
+            data = bytearray(input_file.read())
+
+        if len(data) < sizeof(FrameIndexHeader):
+            raise ValueError(f'Not a frame index file: {index_file}')
+        header = FrameIndexHeader.from_buffer(data)
+        if header.magic != FRAME_INDEX_MAGIC or header.version != FRAME_INDEX_VERSION or \
+                header.entry_size != sizeof(FrameIndexEntry):
+            raise ValueError(f'Not a frame index file or an unsupported version: {index_file}')
+        if len(data) < sizeof(FrameIndexHeader) + header.count * sizeof(FrameIndexEntry):
+            raise ValueError(f'Truncated frame index file: {index_file}')
+
+        entries = (FrameIndexEntry * header.count).from_buffer(data, sizeof(FrameIndexHeader))
+        return cls(entries, header.source_size, header.source_mtime_ns)
+
+    def save(self, index_file: str):
+        """Writes the index to a sidecar file.
+
+        Args:
+            index_file: Path of the index file.
+        """
+        header = FrameIndexHeader(FRAME_INDEX_MAGIC, FRAME_INDEX_VERSION, sizeof(FrameIndexEntry),
+                                  self.source_size, self.source_mtime_ns, len(self.entries))
+        with open(index_file, 'wb') as output_file:
+            output_file.write(bytes(header))
+            output_file.write(self.entries)
+
+    @classmethod
+    def open(cls, input_file: str, json_db: Union[str, jsonreader.JsonReader] = None,
+             index_file: str = None) -> 'FrameIndex':
+        """Loads the index of a file, building and saving it first if it is missing or stale.
+
+        Args:
+            input_file: Indexed file.
+            json_db: JSON database path or JsonReader used if the index has to be built.
+            index_file: Path of the index file. Defaults to the sidecar path of the input file.
+
+        Returns:
+            The index of the file.
+        """
+        index_file = index_file or cls.default_path(input_file)
+        if os.path.exists(index_file):
+            try:
+                index = cls.load(index_file)
+                if index.is_current(input_file):
+                    return index
+            except ValueError:
+                pass
+
+        index = cls.build(input_file, json_db)
+        index.save(index_file)
+        return index
+
+    def is_current(self, input_file: str) -> bool:
+        """Checks that the index was built from the current contents of a file.
+        """
+        stat = os.stat(input_file)
+        return stat.st_size == self.source_size and stat.st_mtime_ns == self.source_mtime_ns
+
+    def select(self, message_ids: Iterable[int] = None, lower_week: int = None, lower_second: float = None,
+               upper_week: int = None, upper_second: float = None,
+               time_statuses: Iterable[common.TIME_STATUS] = None) -> list:
+        """Selects the entries matching message IDs, a time window and time statuses.
+
+        Args:
+            message_ids: Message IDs to include. None includes all.
+            lower_week: GPS week of the start of the time window.
+            lower_second: GPS seconds of the start of the time window. Defaults to the start of lower_week.
+            upper_week: GPS week of the end of the time window.
+            upper_second: GPS seconds of the end of the time window. Defaults to the end of upper_week.
+            time_statuses: Time statuses to include. None includes all.
+
+        Returns:
+            The matching entries in file order.
+        """
+        if (lower_week is None and lower_second is not None) or (upper_week is None and upper_second is not None):
+            raise ValueError('A GPS week is required with the GPS seconds of a time window')
+
+        message_ids = set(message_ids) if message_ids is not None else None
+        time_statuses = {status.value for status in time_statuses} if time_statuses is not None else None
+        lower = None
+        if lower_week is not None:
+            lower = lower_week * common.MILLISECONDS_IN_WEEK + (lower_second or 0) * 1000
+        # The end of the window is inclusive when upper_second is given. Without it, the window runs up to but not
+        # including the start of the next week.
+        upper = end = None
+        if upper_second is not None:
+            upper = upper_week * common.MILLISECONDS_IN_WEEK + upper_second * 1000
+        elif upper_week is not None:
+            end = (upper_week + 1) * common.MILLISECONDS_IN_WEEK
+
+        selection = []
+        for entry in self.entries:
+            if message_ids is not None and entry.message_id not in message_ids:
+                continue
+            if time_statuses is not None and entry.time_status not in time_statuses:
+                continue
+            if lower is not None or upper is not None or end is not None:
+                time = entry.week * common.MILLISECONDS_IN_WEEK + entry.milliseconds
+                if (lower is not None and time < lower) or (upper is not None and time > upper) or \
+                        (end is not None and time >= end):
+                    continue
+            selection.append(entry)
+        return selection
@@ -9,19 +9,124 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 
 Module Description: Holds classes and functions for reading JSON data.
 """
+import hashlib
 import json
+import marshal
 import os
-from collections import defaultdict
+import tempfile
+import threading
+from collections.abc import Mapping
 from ctypes import *
 from enum import Enum
+from typing import Union
 
-from novatel_edie.common import JSON_DB_PATH
-from novatel_edie.decoders.common import DECODERS_DLL, SatelliteId, BaseStructMixin
+from novatel_edie.common import CACHE_PATH, JSON_DB_PATH
+from novatel_edie.decoders.common import DECODERS_DLL, SatelliteId, BaseStructMixin, ctype_to_dtype
 
-DECODERS_DLL.common_jsonreader_init.restype = c_void_p
-DECODERS_DLL.common_jsonreader_init.argtypes = [c_char_p]
-DECODERS_DLL.common_jsonreader_delete.restype = None
-DECODERS_DLL.common_jsonreader_delete.argtypes = [c_void_p]
+DECODERS_DLL.declare({
+    'common_jsonreader_init': (c_void_p, [c_char_p]),
+    'common_jsonreader_delete': (None, [c_void_p]),
+})
+
+# Bumped whenever the layout of the compiled definitions cache changes.
+DEFINITIONS_CACHE_VERSION = 3
+
+
+def _compact_field(field: dict) -> dict:
+    """Strips a JSON field definition down to the keys used to generate its ctypes type.
+    """
+    compact = {'name': field['name'], 'type': field['type'], 'arrayLength': field.get('arrayLength')}
+    if field.get('dataType'):
+        compact['dataType'] = {'name': field['dataType']['name']}
+    if field.get('enumID'):
+        compact['enumID'] = field['enumID']
+    if 'fields' in field:
+        compact['fields'] = [_compact_field(sub_field) for sub_field in field['fields']]
+    return compact
+
+
+def _compact_definitions(json_db: dict) -> dict:
+    """Strips a JSON database down to the enum and message definitions JsonReader generates types from.
+    """
+    return {
+        'enums': [{'_id': enum_def['_id'], 'name': enum_def['name'],
+                   'enumerators': [{'name': enum['name'], 'value': enum['value']} for enum in enum_def['enumerators']]}
+                  for enum_def in json_db['enums']],
+        'messages': [{'messageID': msg_def['messageID'], 'name': msg_def['name'],
+                      'latestMsgDefCrc': msg_def.get('latestMsgDefCrc'),
+                      'fields': {msg_version: [_compact_field(field) for field in fields]
+                                 for msg_version, fields in msg_def['fields'].items()}}
+                     for msg_def in json_db['messages']],
+    }
+
+
+class MessageVersions(Mapping):
+    """Read-only mapping of message definition CRC to the ctypes structure of one message.
+
+    Structures are generated on first lookup and memoized.
+    """
+
+    def __init__(self, json_db, message_id: int):
+        self._json_db = json_db
+        self._message_id = message_id
+        self._definitions = dict()  # CRC -> (message name, JSON fields of that version)
+        self._structures = dict()
+
+    def __getitem__(self, message_crc: int) -> type:
+        structure = self._structures.get(message_crc)
+        if structure is None:
+            name, fields = self._definitions[message_crc]
+            structure = self._structures[message_crc] = self._json_db._generate_message_structure(
+                name, self._message_id, message_crc, fields)
+        return structure
+
+    def __iter__(self):
+        return iter(self._definitions)
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def __contains__(self, message_crc) -> bool:
+        return message_crc in self._definitions
+
+
+class MessageDefinitions(Mapping):
+    """Read-only mapping of message ID to a MessageVersions mapping.
+    """
+
+    def __init__(self, json_db):
+        self._json_db = json_db
+        self._messages = dict()
+        self.ids = dict()  # Message name -> message ID
+        self.names = dict()  # Message ID -> message name
+        self.latest_crcs = dict()  # Message ID -> CRC of the latest message definition
+
+    def _add(self, msg_def: dict):
+        msg_id = msg_def['messageID']
+        versions = self._messages.get(msg_id)
+        if versions is None:
+            versions = self._messages[msg_id] = MessageVersions(self._json_db, msg_id)
+        for msg_version, fields in msg_def['fields'].items():
+            versions._definitions[int(msg_version)] = (msg_def['name'], fields)
+
+        self.ids[msg_def['name']] = msg_id
+        self.names[msg_id] = msg_def['name']
+        latest_crc = msg_def.get('latestMsgDefCrc')
+        if latest_crc is None and msg_def['fields']:
+            latest_crc = int(list(msg_def['fields'])[-1])
+        self.latest_crcs[msg_id] = latest_crc
+
+    def __getitem__(self, message_id: int) -> MessageVersions:
+        return self._messages[message_id]
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __contains__(self, message_id) -> bool:
+        return message_id in self._messages
 
 
 class JsonReader:
@@ -46,24 +151,34 @@ class JsonReader:
         'SATELLITEID': SatelliteId
     }
 
-    def __init__(self, json_db_filepath: str = None):
+    def __init__(self, json_db_filepath: str = None, cache: Union[bool, str] = False):
+        """Initializer.
+
+        Args:
+            json_db_filepath: Path of the JSON database. Defaults to the database shipped with EDIE.
+            cache: Load the Python definitions from a compiled cache keyed by the content hash of the database,
+                creating it if needed. True stores the cache in the user cache directory, a string in that directory.
+        """
+        self._json_db = None
         json_db_filepath = JSON_DB_PATH if not json_db_filepath else json_db_filepath
         if not os.path.exists(json_db_filepath):
             raise FileNotFoundError(f'Invalid path: {json_db_filepath}')
         self._json_db_filepath = json_db_filepath
-        self._json_db = DECODERS_DLL.common_jsonreader_init(json_db_filepath.encode())
-
-        self.enum_definitions = dict()
-        self.message_definitions = defaultdict(dict)
+        self._cache_dir = (CACHE_PATH if cache is True else cache) or None
+        self._exported_definitions = None
+        # The native and Python sides each parse the database on first use, so a process only pays for the side it
+        # needs: parsers that encode to ASCII, BINARY or JSON never touch the Python definitions, while tools working
+        # with the generated structures never load the native reader.
+        self._enum_definitions = None
+        self._enum_ids = None
+        self._enum_value_names = None
+        self._message_definitions = None
+        self._message_dtypes = dict()
+        self._enum_lookups = dict()
         self.response_definition = None
-        with open(self.json_db_filepath) as json_db_file:
-            json_db = json.load(json_db_file)
-
-        self._generate_enum_definitions(json_db)
-        self._generate_message_definitions(json_db)
         self._generate_response_definition()
 
-    def __delete__(self):
+    def __del__(self):
         if self._json_db:
             DECODERS_DLL.common_jsonreader_delete(self._json_db)
 
@@ -76,11 +191,131 @@ class JsonReader:
         self._json_db_filepath = db_fp
         if self._json_db:
             self._json_db = DECODERS_DLL.common_jsonreader_delete(self._json_db)
-            self._json_db = DECODERS_DLL.common_jsonreader_init(self.json_db_filepath.encode())
+        self._exported_definitions = None
+        self._enum_definitions = None
+        self._enum_ids = None
+        self._enum_value_names = None
+        self._message_definitions = None
+        self._message_dtypes.clear()
+        self._enum_lookups.clear()
+
+    @property
+    def enum_definitions(self) -> dict:
+        if self._enum_definitions is None:
+            self._load_definitions()
+        return self._enum_definitions
+
+    @property
+    def message_definitions(self) -> 'MessageDefinitions':
+        if self._message_definitions is None:
+            self._load_definitions()
+        return self._message_definitions
+
+    @property
+    def message_ids(self) -> dict:
+        """Index of message name to message ID.
+        """
+        return self.message_definitions.ids
+
+    @property
+    def message_names(self) -> dict:
+        """Index of message ID to message name.
+        """
+        return self.message_definitions.names
+
+    @property
+    def latest_message_crcs(self) -> dict:
+        """Index of message ID to the CRC of its latest message definition.
+        """
+        return self.message_definitions.latest_crcs
+
+    @property
+    def enum_ids(self) -> dict:
+        """Index of enum name to enum ID.
+        """
+        if self._enum_ids is None:
+            self._load_definitions()
+        return self._enum_ids
+
+    @property
+    def enum_value_names(self) -> dict:
+        """Index of enum ID to a dict of enumerator value to enumerator name.
+        """
+        if self._enum_value_names is None:
+            self._load_definitions()
+        return self._enum_value_names
+
+    def get_latest_message_definition_structure(self, message_name: str) -> type:
+        """Gets the structure of the latest definition of a message.
+
+        Args:
+            message_name: The message name, e.g. BESTPOS.
+
+        Returns:
+            The message body structure.
+        """
+        message_id = self.message_ids[message_name]
+        return self.get_message_definition_structure(message_id, self.latest_message_crcs[message_id])
 
     def get_dll_reference(self):
+        if not self._json_db:
+            self._json_db = DECODERS_DLL.common_jsonreader_init(self.json_db_filepath.encode())
         return self._json_db
 
+    def __reduce__(self):
+        # Pickled readers carry their compact definitions, so spawned worker processes rebuild the Python side
+        # without reading the JSON database. The native side is loaded on first use as usual.
+        return _unpickle_json_reader, (self.json_db_filepath, self.export_definitions())
+
+    def preload(self, structures: bool = True):
+        """Loads the native reader and the Python definitions up front instead of on first use.
+
+        Call this in a parent process before forking workers: children inherit the loaded reader, its native handle
+        and its generated structures copy-on-write instead of loading them again.
+
+        Args:
+            structures: Also generate the ctypes structure of every message definition.
+        """
+        self.get_dll_reference()
+        message_definitions = self.message_definitions
+        if structures:
+            for message_id, versions in message_definitions.items():
+                for message_crc in versions:
+                    self.get_message_definition_structure(message_id, message_crc)
+
+    def export_definitions(self) -> bytes:
+        """Serializes the compact enum and message definitions the Python side is generated from.
+
+        Returns:
+            The definitions in the format of the compiled definitions cache.
+        """
+        if self._exported_definitions is None:
+            if self._cache_dir:
+                definitions = self._load_cached_definitions()
+            else:
+                definitions = _compact_definitions(self._read_json_db())
+            self._exported_definitions = marshal.dumps(definitions)
+        return self._exported_definitions
+
+    def _read_json_db(self) -> dict:
+        with open(self.json_db_filepath) as json_db_file:
+            return json.load(json_db_file)
+
+    def _load_definitions(self):
+        if self._exported_definitions is not None:
+            json_db = marshal.loads(self._exported_definitions)
+        elif self._cache_dir:
+            json_db = self._load_cached_definitions()
+        else:
+            json_db = self._read_json_db()
+
+        self._enum_definitions = dict()
+        self._enum_ids = dict()
+        self._enum_value_names = dict()
+        self._message_definitions = MessageDefinitions(self)
+        self._generate_enum_definitions(json_db)
+        self._generate_message_definitions(json_db)
+
     def _generate_and_write_class_string(self, fp, cls, super_name: str = None):
         class_name = super_name + '_' + cls.__name__ if super_name else cls.__name__
         class_string = f'class {cls.__name__}(Structure, BaseStructMixin):\n'
@@ -105,35 +340,143 @@ class JsonReader:
                     msg_class = self.message_definitions[msg_id][message_crc]
                     self._generate_and_write_class_string(msg_def_fp, msg_class)
 
+    def _load_cached_definitions(self) -> dict:
+        """Loads the compact definitions from the compiled cache, compiling and storing them on a miss.
+
+        The cache file name is derived from the SHA-256 of the database contents, so editing the database
+        invalidates it automatically.
+        """
+        with open(self.json_db_filepath, 'rb') as json_db_file:
+            contents = json_db_file.read()
+
+        digest = hashlib.sha256(contents).hexdigest()
+        cache_file = os.path.join(self._cache_dir,
+                                  f'{digest}.v{DEFINITIONS_CACHE_VERSION}.m{marshal.version}.edie')
+        try:
+            with open(cache_file, 'rb') as cache_fp:
+                return marshal.load(cache_fp)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        definitions = _compact_definitions(json.loads(contents))
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            # Write to a temporary file first so concurrent processes never read a partial cache.
+            with tempfile.NamedTemporaryFile('wb', dir=self._cache_dir, delete=False) as cache_fp:
+                marshal.dump(definitions, cache_fp)
+            os.replace(cache_fp.name, cache_file)
+        except OSError:
+            pass
+        return definitions
+
     def get_message_definition_structure(self, message_id: str, message_crc: str):
         return self.message_definitions[message_id][message_crc]
 
+    def get_message_dtype(self, message_id: int, message_crc: int) -> 'numpy.dtype':
+        """Gets the NumPy dtype matching the packed structure of a message definition. Requires NumPy.
+
+        The dtype has the same field offsets and size as the ctypes structure, including the _length prefixes,
+        padding, nested FIELD_ARRAY sub-structures and SatelliteId fields, so FLATTENED_BINARY message bodies can be
+        viewed with numpy.frombuffer without copying.
+
+        Args:
+            message_id: The message ID.
+            message_crc: The message definition CRC.
+
+        Returns:
+            The message body dtype.
+        """
+        key = (message_id, message_crc)
+        dtype = self._message_dtypes.get(key)
+        if dtype is None:
+            dtype = self._message_dtypes[key] = ctype_to_dtype(
+                self.get_message_definition_structure(message_id, message_crc))
+        return dtype
+
+    def get_message_enum_fields(self, message_id: int, message_crc: int) -> dict:
+        """Gets the enum fields of a message definition.
+
+        Args:
+            message_id: The message ID.
+            message_crc: The message definition CRC.
+
+        Returns:
+            Dict of top-level field name to enum ID.
+        """
+        _, fields = self.message_definitions[message_id]._definitions[message_crc]
+        return {field['name']: field['enumID'] for field in fields if field['type'] == 'ENUM' and field.get('enumID')}
+
+    def _get_enum_lookup(self, enum_id: str) -> tuple:
+        """Gets the sorted enumerator values and matching names of an enum as NumPy arrays.
+        """
+        lookup = self._enum_lookups.get(enum_id)
+        if lookup is None:
+            import numpy as np
+
+            value_names = sorted(self.enum_value_names[enum_id].items())
+            values = np.array([value for value, _ in value_names], dtype=np.int64)
+            names = np.array([name for _, name in value_names] + [None], dtype=object)
+            lookup = self._enum_lookups[enum_id] = (values, names)
+        return lookup
+
+    def decode_enum(self, enum_id: str, values, codes: bool = False):
+        """Maps a column of enum values to enumerator names in one vectorized call. Requires NumPy.
+
+        Args:
+            enum_id: The enum ID, e.g. from get_message_enum_fields.
+            values: Array-like of integer enum values, e.g. a field of a read_batch result.
+            codes: Return categorical codes instead of names.
+
+        Returns:
+            An object array of enumerator names, with None for values that are not in the enum. If codes is True,
+            a tuple of an int32 array of indexes into the names and the object array of enumerator names, with -1
+            for values that are not in the enum. This is the layout of pandas categoricals and Arrow dictionary
+            arrays.
+        """
+        import numpy as np
+
+        enum_values, names = self._get_enum_lookup(enum_id)
+        values = np.asarray(values)
+        indexes = np.searchsorted(enum_values, values)
+        np.minimum(indexes, len(enum_values) - 1, out=indexes)
+        found = enum_values[indexes] == values if len(enum_values) else np.zeros(values.shape, dtype=bool)
+        # The lookup's trailing None is what unknown values map to.
+        indexes = np.where(found, indexes, -1).astype(np.int32)
+        if codes:
+            return indexes, names[:-1]
+        return names[indexes]
+
     def _generate_enum_definitions(self, json_db: dict):
         for enum_def in json_db['enums']:
             enum_id = enum_def['_id']
             enum_name = enum_def['name']
             enum_values = {enum['name']: enum['value'] for enum in enum_def['enumerators']}
-            self.enum_definitions[enum_id] = Enum(enum_name, enum_values)
+            self._enum_definitions[enum_id] = Enum(enum_name, enum_values)
+            self._enum_ids[enum_name] = enum_id
+            # Like Enum, the first enumerator of a value wins over its aliases.
+            value_names = self._enum_value_names[enum_id] = dict()
+            for enum in enum_def['enumerators']:
+                value_names.setdefault(enum['value'], enum['name'])
 
     def _generate_message_definitions(self, json_db: dict):
+        # Only the JSON definitions are indexed here, the structures are generated on first lookup.
         for msg_def in json_db['messages']:
-            msg_id = msg_def['messageID']
+            self._message_definitions._add(msg_def)
 
-            for msg_version in msg_def['fields']:
-                message_crc = int(msg_version)
-                msg_def_fields = list()
-                struct_name = f'{msg_def["name"]}_{msg_id}_{message_crc}'
+    def _generate_message_structure(self, name: str, msg_id: int, message_crc: int, fields: list) -> type:
+        msg_def_fields = list()
+        struct_name = f'{name}_{msg_id}_{message_crc}'
 
-                for field in msg_def['fields'][msg_version]:
-                    field_type = self._novtype_to_ctype(field, struct_name)
-                    if not field_type:
-                        raise f'A critical error occurred when parsing {struct_name}.{field}'
+        for field in fields:
+            field_type = self._novtype_to_ctype(field, struct_name)
+            if not field_type:
+                raise f'A critical error occurred when parsing {struct_name}.{field}'
 
-                    if field['type'] in ['FIELD_ARRAY', 'VARIABLE_LENGTH_ARRAY']:
-                        msg_def_fields.append((field['name'] + '_length', c_uint32))
-                    msg_def_fields.append((field['name'], field_type))
+            if field['type'] in ['FIELD_ARRAY', 'VARIABLE_LENGTH_ARRAY']:
+                msg_def_fields.append((field['name'] + '_length', c_uint32))
+            msg_def_fields.append((field['name'], field_type))
 
-                self.message_definitions[msg_id][message_crc] = self._struct_factory(struct_name, msg_def_fields)
+        return self._struct_factory(struct_name, msg_def_fields)
 
     def _novtype_to_ctype(self, nov_field: dict, super_name: str) -> type:
         field_type = nov_field['type']
@@ -187,3 +530,73 @@ class JsonReader:
         response.str = message[4:]  # There is no b'\0' in this string, responses never contain it.
 
         return response
+
+
+def _unpickle_json_reader(json_db_filepath: str, definitions: bytes) -> JsonReader:
+    """Rebuilds a pickled JsonReader from its exported definitions.
+    """
+    json_reader = JsonReader(json_db_filepath)
+    json_reader._exported_definitions = definitions
+    return json_reader
+
+
+# Shared JsonReaders keyed by resolved database path and modification time.
+_json_readers = dict()
+_json_readers_lock = threading.Lock()
+
+
+def _reset_json_readers_lock():
+    """Replaces the registry lock in a forked child, in case another thread of the parent held it at fork time.
+    """
+    global _json_readers_lock
+    _json_readers_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_json_readers_lock)
+
+
+def get_json_reader(json_db: Union[str, JsonReader] = None) -> JsonReader:
+    """Gets the process-wide shared JsonReader of a database, loading it on first use.
+
+    Components given a database path (or None for the default database) share one JsonReader, and so one native
+    handle, per database. A database file that changed on disk since it was loaded gets a fresh JsonReader.
+
+    Args:
+        json_db: JSON database path or JsonReader. A JsonReader is returned as is.
+
+    Returns:
+        The shared JsonReader of the database.
+    """
+    if isinstance(json_db, JsonReader):
+        return json_db
+
+    json_db_filepath = os.path.realpath(json_db or JSON_DB_PATH)
+    if not os.path.exists(json_db_filepath):
+        raise FileNotFoundError(f'Invalid path: {json_db_filepath}')
+    key = (json_db_filepath, os.stat(json_db_filepath).st_mtime_ns)
+
+    with _json_readers_lock:
+        json_reader = _json_readers.get(key)
+        if json_reader is None:
+            for stale_key in [stale_key for stale_key in _json_readers if stale_key[0] == json_db_filepath]:
+                del _json_readers[stale_key]
+            json_reader = _json_readers[key] = JsonReader(json_db_filepath)
+        return json_reader
+
+
+def evict_json_readers(json_db_filepath: str = None):
+    """Removes shared JsonReaders from the registry.
+
+    Components still holding an evicted JsonReader keep using it; it is freed once the last of them is deleted.
+
+    Args:
+        json_db_filepath: Database whose JsonReader is removed. None removes all of them.
+    """
+    with _json_readers_lock:
+        if json_db_filepath is None:
+            _json_readers.clear()
+            return
+        json_db_filepath = os.path.realpath(json_db_filepath)
+        for key in [key for key in _json_readers if key[0] == json_db_filepath]:
+            del _json_readers[key]
@@ -14,16 +14,13 @@ from ctypes import *
 from novatel_edie.common import LogLevelEnum
 from novatel_edie.decoders.common import DECODERS_DLL
 
-DECODERS_DLL.common_logger_setup.restype = None
-DECODERS_DLL.common_logger_setup.argtypes = None
-DECODERS_DLL.common_logger_setup_from_file.restype = None
-DECODERS_DLL.common_logger_setup_from_file.argtypes = [c_char_p]
-DECODERS_DLL.common_logger_set_logger_level.restype = c_bool
-DECODERS_DLL.common_logger_set_logger_level.argtypes = [c_int32]
-DECODERS_DLL.common_logger_shutdown_logger.restype = None
-DECODERS_DLL.common_logger_shutdown_logger.argtypes = None
-DECODERS_DLL.common_logger_log.restype = c_bool
-DECODERS_DLL.common_logger_log.argtypes = [c_int32, c_char_p]
+DECODERS_DLL.declare({
+    'common_logger_setup': (None, None),
+    'common_logger_setup_from_file': (None, [c_char_p]),
+    'common_logger_set_logger_level': (c_bool, [c_int32]),
+    'common_logger_shutdown_logger': (None, None),
+    'common_logger_log': (c_bool, [c_int32, c_char_p]),
+})
 
 
 class Logger:
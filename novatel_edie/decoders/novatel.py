@@ -10,6 +10,7 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 Module Description: Holds classes and functions for NovAtel.
 """
 import copy
+import operator
 import os
 import typing
 import ctypes
@@ -20,206 +21,118 @@ from novatel_edie.decoders import common, jsonreader
 from novatel_edie.decoders.common import DECODERS_DLL, MetaDataStruct, MessageDataStruct, HeaderFormatEnum
 from novatel_edie.interfaces import file_stream
 
-# Framer
-DECODERS_DLL.novatel_framer_set_logger_level.restype = c_bool
-DECODERS_DLL.novatel_framer_set_logger_level.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_framer_shutdown_logger.restype = None
-DECODERS_DLL.novatel_framer_shutdown_logger.argtypes = [c_void_p]
-DECODERS_DLL.novatel_framer_init.restype = c_void_p
-DECODERS_DLL.novatel_framer_init.argtypes = None
-DECODERS_DLL.novatel_framer_delete.restype = None
-DECODERS_DLL.novatel_framer_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_framer_frame_json.restype = None
-DECODERS_DLL.novatel_framer_frame_json.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_framer_payload_only.restype = None
-DECODERS_DLL.novatel_framer_payload_only.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_framer_report_unknown_bytes.restype = None
-DECODERS_DLL.novatel_framer_report_unknown_bytes.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_framer_get_available_bytes.restype = c_uint32
-DECODERS_DLL.novatel_framer_get_available_bytes.argtypes = [c_void_p]
-DECODERS_DLL.novatel_framer_write.restype = c_uint32
-DECODERS_DLL.novatel_framer_write.argtypes = [c_void_p, c_char_p, c_uint32]
-DECODERS_DLL.novatel_framer_read.restype = c_uint32
-DECODERS_DLL.novatel_framer_read.argtypes = [c_void_p, c_char_p, c_uint32, c_void_p]
-DECODERS_DLL.novatel_framer_flush.restype = c_uint32
-DECODERS_DLL.novatel_framer_flush.argtypes = [c_void_p, c_char_p, c_uint32]
-
-# Filter
-DECODERS_DLL.novatel_filter_set_logger_level.restype = c_bool
-DECODERS_DLL.novatel_filter_set_logger_level.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_filter_shutdown_logger.restype = None
-DECODERS_DLL.novatel_filter_shutdown_logger.argtypes = [c_void_p]
-DECODERS_DLL.novatel_filter_init.restype = c_void_p
-DECODERS_DLL.novatel_filter_init.argtypes = None
-DECODERS_DLL.novatel_filter_delete.restype = None
-DECODERS_DLL.novatel_filter_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_filter_set_include_lower_time.restype = None
-DECODERS_DLL.novatel_filter_set_include_lower_time.argtypes = [c_void_p, c_uint32, c_double]
-DECODERS_DLL.novatel_filter_set_include_upper_time.restype = None
-DECODERS_DLL.novatel_filter_set_include_upper_time.argtypes = [c_void_p, c_uint32, c_double]
-DECODERS_DLL.novatel_filter_invert_time_filter.restype = None
-DECODERS_DLL.novatel_filter_invert_time_filter.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_filter_set_include_decimation.restype = None
-DECODERS_DLL.novatel_filter_set_include_decimation.argtypes = [c_void_p, c_double]
-DECODERS_DLL.novatel_filter_invert_decimation_filter.restype = None
-DECODERS_DLL.novatel_filter_invert_decimation_filter.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_filter_include_time_status.restype = None
-DECODERS_DLL.novatel_filter_include_time_status.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_filter_invert_time_status_filter.restype = None
-DECODERS_DLL.novatel_filter_invert_time_status_filter.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_filter_include_message_id.restype = None
-DECODERS_DLL.novatel_filter_include_message_id.argtypes = [c_void_p, c_uint32, c_uint32, c_uint32]
-DECODERS_DLL.novatel_filter_invert_message_id_filter.restype = None
-DECODERS_DLL.novatel_filter_invert_message_id_filter.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_filter_include_message_name.restype = None
-DECODERS_DLL.novatel_filter_include_message_name.argtypes = [c_void_p, c_char_p, c_uint32, c_uint32]
-DECODERS_DLL.novatel_filter_invert_message_name_filter.restype = None
-DECODERS_DLL.novatel_filter_invert_message_name_filter.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_filter_include_nmea_messages.restype = None
-DECODERS_DLL.novatel_filter_include_nmea_messages.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_filter_do_filtering.restype = c_bool
-DECODERS_DLL.novatel_filter_do_filtering.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_filter_clear_filters.restype = None
-DECODERS_DLL.novatel_filter_clear_filters.argtypes = [c_void_p]
-
-# Header Decoder
-DECODERS_DLL.novatel_header_decoder_set_logger_level.restype = c_bool
-DECODERS_DLL.novatel_header_decoder_set_logger_level.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_header_decoder_shutdown_logger.restype = None
-DECODERS_DLL.novatel_header_decoder_shutdown_logger.argtypes = [c_void_p]
-DECODERS_DLL.novatel_header_decoder_init.restype = c_void_p
-DECODERS_DLL.novatel_header_decoder_init.argtypes = [c_void_p]
-DECODERS_DLL.novatel_header_decoder_delete.restype = None
-DECODERS_DLL.novatel_header_decoder_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_header_decoder_load_json.restype = None
-DECODERS_DLL.novatel_header_decoder_load_json.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_header_decoder_decode.restype = c_uint32
-DECODERS_DLL.novatel_header_decoder_decode.argtypes = [c_void_p, c_char_p, c_void_p, c_void_p]
-
-# Intermediate Message
-DECODERS_DLL.novatel_intermediate_message_init.restype = c_void_p
-DECODERS_DLL.novatel_intermediate_message_init.argtypes = None
-DECODERS_DLL.novatel_intermediate_message_delete.restype = None
-DECODERS_DLL.novatel_intermediate_message_delete.argtypes = [c_void_p]
-
-# Message Decoder
-DECODERS_DLL.novatel_message_decoder_set_logger_level.restype = c_bool
-DECODERS_DLL.novatel_message_decoder_set_logger_level.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_message_decoder_shutdown_logger.restype = None
-DECODERS_DLL.novatel_message_decoder_shutdown_logger.argtypes = [c_void_p]
-DECODERS_DLL.novatel_message_decoder_init.restype = c_void_p
-DECODERS_DLL.novatel_message_decoder_init.argtypes = [c_void_p]
-DECODERS_DLL.novatel_message_decoder_delete.restype = None
-DECODERS_DLL.novatel_message_decoder_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_message_decoder_load_json.restype = None
-DECODERS_DLL.novatel_message_decoder_load_json.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_message_decoder_decode.restype = c_uint32
-DECODERS_DLL.novatel_message_decoder_decode.argtypes = [c_void_p, c_char_p, c_void_p, c_void_p]
-
-# Encoder
-DECODERS_DLL.novatel_encoder_set_logger_level.restype = c_bool
-DECODERS_DLL.novatel_encoder_set_logger_level.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_encoder_shutdown_logger.restype = None
-DECODERS_DLL.novatel_encoder_shutdown_logger.argtypes = [c_void_p]
-DECODERS_DLL.novatel_encoder_init.restype = c_void_p
-DECODERS_DLL.novatel_encoder_init.argtypes = [c_void_p]
-DECODERS_DLL.novatel_encoder_delete.restype = None
-DECODERS_DLL.novatel_encoder_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_encoder_load_json.restype = None
-DECODERS_DLL.novatel_encoder_load_json.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_encoder_encode.restype = c_uint32
-DECODERS_DLL.novatel_encoder_encode.argtypes = [
-    c_void_p, c_char_p, c_uint32, c_void_p, c_void_p, c_void_p, c_void_p, c_uint32]
-
-# Parser
-DECODERS_DLL.novatel_parser_init.restype = c_void_p
-DECODERS_DLL.novatel_parser_init.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_delete.restype = None
-DECODERS_DLL.novatel_parser_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_load_json_db.restype = None
-DECODERS_DLL.novatel_parser_load_json_db.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_parser_get_ignore_abbrev_ascii_responses.restype = c_bool
-DECODERS_DLL.novatel_parser_get_ignore_abbrev_ascii_responses.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_set_ignore_abbrev_ascii_responses.restype = None
-DECODERS_DLL.novatel_parser_set_ignore_abbrev_ascii_responses.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_parser_get_decompress_rangecmp.restype = c_bool
-DECODERS_DLL.novatel_parser_get_decompress_rangecmp.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_set_decompress_rangecmp.restype = None
-DECODERS_DLL.novatel_parser_set_decompress_rangecmp.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_parser_get_return_unknownbytes.restype = c_bool
-DECODERS_DLL.novatel_parser_get_return_unknownbytes.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_set_return_unknownbytes.restype = None
-DECODERS_DLL.novatel_parser_set_return_unknownbytes.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_parser_get_encodeformat.restype = c_uint32
-DECODERS_DLL.novatel_parser_get_encodeformat.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_set_encodeformat.restype = None
-DECODERS_DLL.novatel_parser_set_encodeformat.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_parser_get_filter.restype = c_void_p
-DECODERS_DLL.novatel_parser_get_filter.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_set_filter.restype = None
-DECODERS_DLL.novatel_parser_set_filter.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_parser_get_buffer.restype = c_char_p
-DECODERS_DLL.novatel_parser_get_buffer.argtypes = [c_void_p]
-DECODERS_DLL.novatel_parser_write.restype = c_uint32
-DECODERS_DLL.novatel_parser_write.argtypes = [c_void_p, c_char_p, c_uint32]
-DECODERS_DLL.novatel_parser_read.restype = c_uint32
-DECODERS_DLL.novatel_parser_read.argtypes = [c_void_p, c_void_p, c_void_p]
-DECODERS_DLL.novatel_parser_flush.restype = c_uint32
-DECODERS_DLL.novatel_parser_flush.argtypes = [c_void_p, c_char_p, c_uint32]
-
-# Fileparser
-DECODERS_DLL.novatel_fileparser_init.restype = c_void_p
-DECODERS_DLL.novatel_fileparser_init.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_delete.restype = None
-DECODERS_DLL.novatel_fileparser_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_load_json_db.restype = None
-DECODERS_DLL.novatel_fileparser_load_json_db.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_fileparser_get_ignore_abbrev_ascii_responses.restype = c_bool
-DECODERS_DLL.novatel_fileparser_get_ignore_abbrev_ascii_responses.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_set_ignore_abbrev_ascii_responses.restype = None
-DECODERS_DLL.novatel_fileparser_set_ignore_abbrev_ascii_responses.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_fileparser_get_decompress_rangecmp.restype = c_bool
-DECODERS_DLL.novatel_fileparser_get_decompress_rangecmp.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_set_decompress_rangecmp.restype = None
-DECODERS_DLL.novatel_fileparser_set_decompress_rangecmp.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_fileparser_get_return_unknownbytes.restype = c_bool
-DECODERS_DLL.novatel_fileparser_get_return_unknownbytes.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_set_return_unknownbytes.restype = None
-DECODERS_DLL.novatel_fileparser_set_return_unknownbytes.argtypes = [c_void_p, c_bool]
-DECODERS_DLL.novatel_fileparser_get_encodeformat.restype = c_uint32
-DECODERS_DLL.novatel_fileparser_get_encodeformat.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_set_encodeformat.restype = None
-DECODERS_DLL.novatel_fileparser_set_encodeformat.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_fileparser_get_filter.restype = c_void_p
-DECODERS_DLL.novatel_fileparser_get_filter.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_set_filter.restype = None
-DECODERS_DLL.novatel_fileparser_set_filter.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_fileparser_get_buffer.restype = c_char_p
-DECODERS_DLL.novatel_fileparser_get_buffer.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_set_stream.restype = c_bool
-DECODERS_DLL.novatel_fileparser_set_stream.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_fileparser_get_percent_read.restype = c_uint32
-DECODERS_DLL.novatel_fileparser_get_percent_read.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_read.restype = c_uint32
-DECODERS_DLL.novatel_fileparser_read.argtypes = [c_void_p, c_void_p, c_void_p]
-DECODERS_DLL.novatel_fileparser_reset.restype = c_bool
-DECODERS_DLL.novatel_fileparser_reset.argtypes = [c_void_p]
-DECODERS_DLL.novatel_fileparser_flush.restype = c_uint32
-DECODERS_DLL.novatel_fileparser_flush.argtypes = [c_void_p, c_char_p, c_uint32]
-
-# Commander
-DECODERS_DLL.novatel_commander_set_logger_level.restype = c_bool
-DECODERS_DLL.novatel_commander_set_logger_level.argtypes = [c_void_p, c_uint32]
-DECODERS_DLL.novatel_commander_shutdown_logger.restype = None
-DECODERS_DLL.novatel_commander_shutdown_logger.argtypes = [c_void_p]
-DECODERS_DLL.novatel_commander_init.restype = c_void_p
-DECODERS_DLL.novatel_commander_init.argtypes = [c_void_p]
-DECODERS_DLL.novatel_commander_delete.restype = None
-DECODERS_DLL.novatel_commander_delete.argtypes = [c_void_p]
-DECODERS_DLL.novatel_commander_load_json.restype = None
-DECODERS_DLL.novatel_commander_load_json.argtypes = [c_void_p, c_void_p]
-DECODERS_DLL.novatel_commander_encode.restype = c_uint32
-DECODERS_DLL.novatel_commander_encode.argtypes = [c_void_p, c_void_p, c_uint32, c_void_p, c_void_p, c_uint32]
+# Function prototypes, name: (restype, argtypes). They are applied when the library is first used.
+DECODERS_DLL.declare({
+    # Framer
+    'novatel_framer_set_logger_level': (c_bool, [c_void_p, c_uint32]),
+    'novatel_framer_shutdown_logger': (None, [c_void_p]),
+    'novatel_framer_init': (c_void_p, None),
+    'novatel_framer_delete': (None, [c_void_p]),
+    'novatel_framer_frame_json': (None, [c_void_p, c_bool]),
+    'novatel_framer_payload_only': (None, [c_void_p, c_bool]),
+    'novatel_framer_report_unknown_bytes': (None, [c_void_p, c_bool]),
+    'novatel_framer_get_available_bytes': (c_uint32, [c_void_p]),
+    'novatel_framer_write': (c_uint32, [c_void_p, c_char_p, c_uint32]),
+    'novatel_framer_read': (c_uint32, [c_void_p, c_char_p, c_uint32, c_void_p]),
+    'novatel_framer_flush': (c_uint32, [c_void_p, c_char_p, c_uint32]),
+
+    # Filter
+    'novatel_filter_set_logger_level': (c_bool, [c_void_p, c_uint32]),
+    'novatel_filter_shutdown_logger': (None, [c_void_p]),
+    'novatel_filter_init': (c_void_p, None),
+    'novatel_filter_delete': (None, [c_void_p]),
+    'novatel_filter_set_include_lower_time': (None, [c_void_p, c_uint32, c_double]),
+    'novatel_filter_set_include_upper_time': (None, [c_void_p, c_uint32, c_double]),
+    'novatel_filter_invert_time_filter': (None, [c_void_p, c_bool]),
+    'novatel_filter_set_include_decimation': (None, [c_void_p, c_double]),
+    'novatel_filter_invert_decimation_filter': (None, [c_void_p, c_bool]),
+    'novatel_filter_include_time_status': (None, [c_void_p, c_uint32]),
+    'novatel_filter_invert_time_status_filter': (None, [c_void_p, c_bool]),
+    'novatel_filter_include_message_id': (None, [c_void_p, c_uint32, c_uint32, c_uint32]),
+    'novatel_filter_invert_message_id_filter': (None, [c_void_p, c_bool]),
+    'novatel_filter_include_message_name': (None, [c_void_p, c_char_p, c_uint32, c_uint32]),
+    'novatel_filter_invert_message_name_filter': (None, [c_void_p, c_bool]),
+    'novatel_filter_include_nmea_messages': (None, [c_void_p, c_bool]),
+    'novatel_filter_do_filtering': (c_bool, [c_void_p, c_void_p]),
+    'novatel_filter_clear_filters': (None, [c_void_p]),
+
+    # Header Decoder
+    'novatel_header_decoder_set_logger_level': (c_bool, [c_void_p, c_uint32]),
+    'novatel_header_decoder_shutdown_logger': (None, [c_void_p]),
+    'novatel_header_decoder_init': (c_void_p, [c_void_p]),
+    'novatel_header_decoder_delete': (None, [c_void_p]),
+    'novatel_header_decoder_load_json': (None, [c_void_p, c_void_p]),
+    'novatel_header_decoder_decode': (c_uint32, [c_void_p, c_char_p, c_void_p, c_void_p]),
+
+    # Intermediate Message
+    'novatel_intermediate_message_init': (c_void_p, None),
+    'novatel_intermediate_message_delete': (None, [c_void_p]),
+
+    # Message Decoder
+    'novatel_message_decoder_set_logger_level': (c_bool, [c_void_p, c_uint32]),
+    'novatel_message_decoder_shutdown_logger': (None, [c_void_p]),
+    'novatel_message_decoder_init': (c_void_p, [c_void_p]),
+    'novatel_message_decoder_delete': (None, [c_void_p]),
+    'novatel_message_decoder_load_json': (None, [c_void_p, c_void_p]),
+    'novatel_message_decoder_decode': (c_uint32, [c_void_p, c_char_p, c_void_p, c_void_p]),
+
+    # Encoder
+    'novatel_encoder_set_logger_level': (c_bool, [c_void_p, c_uint32]),
+    'novatel_encoder_shutdown_logger': (None, [c_void_p]),
+    'novatel_encoder_init': (c_void_p, [c_void_p]),
+    'novatel_encoder_delete': (None, [c_void_p]),
+    'novatel_encoder_load_json': (None, [c_void_p, c_void_p]),
+    'novatel_encoder_encode': (
+        c_uint32, [c_void_p, c_char_p, c_uint32, c_void_p, c_void_p, c_void_p, c_void_p, c_uint32]),
+
+    # Parser
+    'novatel_parser_init': (c_void_p, [c_void_p]),
+    'novatel_parser_delete': (None, [c_void_p]),
+    'novatel_parser_load_json_db': (None, [c_void_p, c_void_p]),
+    'novatel_parser_get_ignore_abbrev_ascii_responses': (c_bool, [c_void_p]),
+    'novatel_parser_set_ignore_abbrev_ascii_responses': (None, [c_void_p, c_bool]),
+    'novatel_parser_get_decompress_rangecmp': (c_bool, [c_void_p]),
+    'novatel_parser_set_decompress_rangecmp': (None, [c_void_p, c_bool]),
+    'novatel_parser_get_return_unknownbytes': (c_bool, [c_void_p]),
+    'novatel_parser_set_return_unknownbytes': (None, [c_void_p, c_bool]),
+    'novatel_parser_get_encodeformat': (c_uint32, [c_void_p]),
+    'novatel_parser_set_encodeformat': (None, [c_void_p, c_uint32]),
+    'novatel_parser_get_filter': (c_void_p, [c_void_p]),
+    'novatel_parser_set_filter': (None, [c_void_p, c_void_p]),
+    'novatel_parser_get_buffer': (c_char_p, [c_void_p]),
+    'novatel_parser_write': (c_uint32, [c_void_p, c_char_p, c_uint32]),
+    'novatel_parser_read': (c_uint32, [c_void_p, c_void_p, c_void_p]),
+    'novatel_parser_flush': (c_uint32, [c_void_p, c_char_p, c_uint32]),
+
+    # Fileparser
+    'novatel_fileparser_init': (c_void_p, [c_void_p]),
+    'novatel_fileparser_delete': (None, [c_void_p]),
+    'novatel_fileparser_load_json_db': (None, [c_void_p, c_void_p]),
+    'novatel_fileparser_get_ignore_abbrev_ascii_responses': (c_bool, [c_void_p]),
+    'novatel_fileparser_set_ignore_abbrev_ascii_responses': (None, [c_void_p, c_bool]),
+    'novatel_fileparser_get_decompress_rangecmp': (c_bool, [c_void_p]),
+    'novatel_fileparser_set_decompress_rangecmp': (None, [c_void_p, c_bool]),
+    'novatel_fileparser_get_return_unknownbytes': (c_bool, [c_void_p]),
+    'novatel_fileparser_set_return_unknownbytes': (None, [c_void_p, c_bool]),
+    'novatel_fileparser_get_encodeformat': (c_uint32, [c_void_p]),
+    'novatel_fileparser_set_encodeformat': (None, [c_void_p, c_uint32]),
+    'novatel_fileparser_get_filter': (c_void_p, [c_void_p]),
+    'novatel_fileparser_set_filter': (None, [c_void_p, c_void_p]),
+    'novatel_fileparser_get_buffer': (c_char_p, [c_void_p]),
+    'novatel_fileparser_set_stream': (c_bool, [c_void_p, c_void_p]),
+    'novatel_fileparser_get_percent_read': (c_uint32, [c_void_p]),
+    'novatel_fileparser_read': (c_uint32, [c_void_p, c_void_p, c_void_p]),
+    'novatel_fileparser_reset': (c_bool, [c_void_p]),
+    'novatel_fileparser_flush': (c_uint32, [c_void_p, c_char_p, c_uint32]),
+
+    # Commander
+    'novatel_commander_set_logger_level': (c_bool, [c_void_p, c_uint32]),
+    'novatel_commander_shutdown_logger': (None, [c_void_p]),
+    'novatel_commander_init': (c_void_p, [c_void_p]),
+    'novatel_commander_delete': (None, [c_void_p]),
+    'novatel_commander_load_json': (None, [c_void_p, c_void_p]),
+    'novatel_commander_encode': (c_uint32, [c_void_p, c_void_p, c_uint32, c_void_p, c_void_p, c_uint32]),
+})
 
 
 ################################################################################
@@ -281,9 +194,65 @@ class OEM4BinaryShortHeader(common.StructureOutput):
     ]
 
 
+def _array_accessor(field_name: str, length_name: str):
+    if length_name is None:
+        return operator.attrgetter(field_name)
+    return lambda structure: getattr(structure, field_name)[:getattr(structure, length_name)]
+
+
+def _nested_array_accessor(field_name: str, length_name: str, element_field_name: str):
+    if length_name is None:
+        return lambda structure: [getattr(element, element_field_name) for element in getattr(structure, field_name)]
+    return lambda structure: [getattr(element, element_field_name)
+                              for element in getattr(structure, field_name)[:getattr(structure, length_name)]]
+
+
+def _field_accessors(structure_type: type) -> dict:
+    """Gets the table of field name to getter of a structure type, building it on first use.
+
+    The table is stored on the structure type itself. Top-level fields map to direct attribute getters, arrays to
+    getters that constrain them to the length in their _length field, and the fields of FIELD_ARRAY elements to
+    getters that collect them from every element in use. As in a linear search of _fields_, the first field of a
+    name wins.
+
+    Args:
+        structure_type: ctypes structure type.
+
+    Returns:
+        Dict of field name to getter taking a structure instance.
+    """
+    accessors = structure_type.__dict__.get('_field_accessors_')
+    if accessors is not None:
+        return accessors
+
+    fields = getattr(structure_type, '_fields_', None)
+    if fields is None:
+        return {}
+
+    field_names = {field_name for field_name, _ in fields}
+    accessors = dict()
+    for field_name, field_type in fields:
+        length_name = f'{field_name}_length' if f'{field_name}_length' in field_names else None
+        if issubclass(field_type, ctypes.Array):
+            accessors.setdefault(field_name, _array_accessor(field_name, length_name))
+            # At this point there are no messages that have depth greater than 1.
+            element_type = field_type._type_
+            if not field_name.endswith('_length') and hasattr(element_type, '_fields_'):
+                for element_field_name, _ in element_type._fields_:
+                    accessors.setdefault(element_field_name,
+                                         _nested_array_accessor(field_name, length_name, element_field_name))
+        else:
+            accessors.setdefault(field_name, operator.attrgetter(field_name))
+
+    setattr(structure_type, '_field_accessors_', accessors)
+    return accessors
+
+
 class Message:
     """ Class that holds a message, broken into a header and a body
     """
+    # No per-instance __dict__, as one Message is created per decoded message.
+    __slots__ = ('header', 'body')
 
     def __init__(self,
                  header: OEM4BinaryHeader,
@@ -292,54 +261,71 @@ class Message:
         self.body = body
 
     def __deepcopy__(self, memo=None):
-        cpy = type(self)(None, None)
         memo = {} if memo is None else memo
+        if self.header is not None and self.body is not None:
+            cpy = memo[id(self)] = self.detach()
+            return cpy
+
+        cpy = type(self)(None, None)
         memo[id(self)] = cpy
 
         cpy.header = copy.deepcopy(self.header, memo)
         cpy.body = copy.deepcopy(self.body, memo)
         return cpy
 
+    def detach(self, arena: 'MessageArena' = None) -> 'Message':
+        """Copies the message into memory it owns.
+
+        The messages returned by the parsers and the decoders view a buffer that the component reuses, so they are
+        only valid until its next read. Detaching copies the header and body with a single memmove (two if they
+        are not contiguous) instead of deep copying them field by field.
+
+        Args:
+            arena: MessageArena to copy the message into. By default the message gets its own buffer.
+
+        Returns:
+            The detached message.
+        """
+        header_size = sizeof(self.header)
+        body_size = sizeof(self.body)
+        if arena is None:
+            buffer, offset = create_string_buffer(header_size + body_size), 0
+        else:
+            buffer, offset = arena.allocate(header_size + body_size)
+
+        address = addressof(buffer) + offset
+        header_address = addressof(self.header)
+        body_address = addressof(self.body)
+        if body_address == header_address + header_size:
+            memmove(address, header_address, header_size + body_size)
+        else:
+            memmove(address, header_address, header_size)
+            memmove(address + header_size, body_address, body_size)
+
+        return type(self)(type(self.header).from_buffer(buffer, offset),
+                          type(self.body).from_buffer(buffer, offset + header_size))
+
     @staticmethod
     def _find_nested_attribute(structure, field_name):
-        # Store the array lengths. Makes it possible to constrain the arrays the amount of data vs the max array size
-        array_lengths = {}
-        for element_name, element_type in structure._fields_:
-            field_value = structure.__getattribute__(element_name)
-
-            # The desired field exists directly at the top level of the message class
-            if element_name == field_name:
-                if issubclass(element_type, ctypes.Array):
-                    element_array_length = array_lengths[element_name]
-                    return field_value[:element_array_length]
-                return field_value
-
-            if element_name.endswith('_length'):
-                array_lengths[element_name.rsplit('_', 1)[0]] = field_value
-
-            # If the element is an array then look if the array elements contain the attribute
-            # At this point there are no messages that have depth greater than 1. If that changes in the future
-            # a recursive call to this function would be required in the future.
-            elif issubclass(element_type, ctypes.Array):
-                if hasattr(element_type._type_, field_name):
-                    element_array_length = array_lengths[element_name]
-                    return [getattr(arr_element, field_name) for arr_element in field_value[:element_array_length]]
-
-        raise AttributeError(f'\'{type(structure).__name__}\' object has no attribute \'{field_name}\'')
+        accessor = _field_accessors(type(structure)).get(field_name)
+        if accessor is None:
+            raise AttributeError(f'\'{type(structure).__name__}\' object has no attribute \'{field_name}\'')
+        return accessor(structure)
 
     def __getattr__(self, item):
-        value = None
+        # header and body are plain instance attributes, only missing while an instance is being built or copied.
+        if item in ('header', 'body'):
+            raise AttributeError(item)
 
-        try:
-            value = Message._find_nested_attribute(self.body, item)
-        except AttributeError:
-            pass
+        value = None
+        accessor = _field_accessors(type(self.body)).get(item)
+        if accessor is not None:
+            value = accessor(self.body)
 
         if value is None:
-            try:
-                value = self._find_nested_attribute(self.header, item)
-            except AttributeError:
-                pass
+            accessor = _field_accessors(type(self.header)).get(item)
+            if accessor is not None:
+                value = accessor(self.header)
 
         if value is None:
             raise AttributeError(f'{type(self).__name__} {type(self.body).__name__} object has no attribute \'{item}\'')
@@ -364,6 +350,7 @@ class Response(Message):
         Class to support copying of responses. Several fields in the auto-generated RESPONSE_0_0
         type do not play nice with copying.
     """
+    __slots__ = ()
 
     def __deepcopy__(self, memo=None):
         cpy = type(self)(None, type(self.body)())
@@ -378,6 +365,17 @@ class Response(Message):
 
         return cpy
 
+    def detach(self, arena: 'MessageArena' = None) -> 'Response':
+        """Copies the response into memory it owns. See Message.detach.
+
+        Response bodies are always owned already, since they are built in Python, so only the header is copied and
+        the arena is not used.
+        """
+        body = type(self.body)()
+        body.id = self.body.id
+        body.str = self.body.str
+        return type(self)(type(self.header).from_buffer_copy(self.header), body)
+
     # The id and str fields are accessible without these properties, but this way it is more explicit
     @property
     def id(self):
@@ -388,6 +386,99 @@ class Response(Message):
         return self.__getattr__('str')
 
 
+class MessageArena:
+    """Owned memory for keeping many detached messages.
+
+    Messages detached into an arena are packed into large chunks, so keeping N messages costs N memmoves and a
+    handful of allocations rather than one allocation each. A chunk is freed once none of its messages are referenced.
+    """
+
+    def __init__(self, chunk_size: int = common.MESSAGE_SIZE_MAX * 32):
+        """Initializer.
+
+        Args:
+            chunk_size: Size in bytes of each chunk. Messages larger than this get a buffer of their own.
+        """
+        self.chunk_size = chunk_size
+        self._chunk = None
+        self._offset = 0
+
+    def allocate(self, size: int) -> tuple:
+        """Reserves space in the arena.
+
+        Args:
+            size: Number of bytes to reserve.
+
+        Returns:
+            Tuple of the ctypes buffer holding the space and the offset of the space in it.
+        """
+        if size > self.chunk_size:
+            return create_string_buffer(size), 0
+        if self._chunk is None or self._offset + size > self.chunk_size:
+            self._chunk = create_string_buffer(self.chunk_size)
+            self._offset = 0
+        offset = self._offset
+        self._offset += size
+        return self._chunk, offset
+
+    def detach(self, message: Message) -> Message:
+        """Copies a message into the arena. See Message.detach.
+        """
+        return message.detach(self)
+
+
+class FrameBatch:
+    """Frames drained from a Framer by read_many(), stored back to back in a single arena buffer.
+
+    The frames, statuses, offsets, lengths and meta data all live in buffers owned by the Framer and are only valid
+    until the next call to read_many(). The meta_data member is a ctypes array of MetaDataStruct, so it can be viewed
+    as a NumPy structured array with numpy.ctypeslib.as_array() without copying.
+    """
+
+    def __init__(self, arena, statuses, offsets, lengths, meta_data, count: int):
+        self._arena = arena
+        self._arena_view = memoryview(arena).cast('B')
+        self.statuses = statuses
+        self.offsets = offsets
+        self.lengths = lengths
+        self.meta_data = meta_data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for idx in range(self._count):
+            yield self[idx]
+
+    def __getitem__(self, idx: int) -> tuple:
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError('FrameBatch index out of range')
+        return common.STATUS(self.statuses[idx]), self.frame(idx), self.meta_data[idx]
+
+    def frame(self, idx: int) -> memoryview:
+        """Gets a view of a single frame in the arena.
+
+        Args:
+            idx: Index of the frame in the batch.
+
+        Returns:
+            A memoryview over the frame bytes. Call tobytes() on it to keep a copy.
+        """
+        offset = self.offsets[idx]
+        return self._arena_view[offset:offset + self.lengths[idx]]
+
+    @property
+    def data(self) -> memoryview:
+        """A view of every frame in the batch, back to back.
+        """
+        if not self._count:
+            return self._arena_view[:0]
+        return self._arena_view[:self.offsets[self._count - 1] + self.lengths[self._count - 1]]
+
+
 ################################################################################
 # NovAtel EDIE Components
 ################################################################################
@@ -395,21 +486,31 @@ class Framer:
     """Framer class for NovAtel messages.
     """
 
-    def __init__(self, report_unknown_bytes: bool = True, payload_only: bool = False, frame_json: bool = False):
+    def __init__(self, report_unknown_bytes: bool = True, payload_only: bool = False, frame_json: bool = False,
+                 zero_copy: bool = False):
         """Initializer.
 
         Args:
             report_unknown_bytes (bool): return unknown bytes
             payload_only (bool): frame message body only
             frame_json (bool): frame json objects
+            zero_copy (bool): return frames as memoryviews over the internal read buffer instead of bytes
         """
         self._report_unknown_bytes = report_unknown_bytes
         self._payload_only = payload_only
         self._frame_json = frame_json
+        self._zero_copy = zero_copy
         self._framer = common.DECODERS_DLL.novatel_framer_init()
         self._read_buf_size = common.MESSAGE_SIZE_MAX
         self._read_buf = create_string_buffer(self._read_buf_size)
+        self._read_view = memoryview(self._read_buf).cast('B')
         self._meta_data = MetaDataStruct()
+        self._arena = None
+        self._batch_frames = 0
+        self._batch_statuses = None
+        self._batch_offsets = None
+        self._batch_lengths = None
+        self._batch_meta_data = None
         common.DECODERS_DLL.novatel_framer_report_unknown_bytes(self._framer, self._report_unknown_bytes)
         common.DECODERS_DLL.novatel_framer_payload_only(self._framer, self._payload_only)
         common.DECODERS_DLL.novatel_framer_frame_json(self._framer, self._frame_json)
@@ -455,6 +556,14 @@ class Framer:
         self._frame_json = value
         common.DECODERS_DLL.novatel_framer_frame_json(self._framer, self._frame_json)
 
+    @property
+    def zero_copy(self):
+        return self._zero_copy
+
+    @zero_copy.setter
+    def zero_copy(self, value: bool):
+        self._zero_copy = value
+
     @property
     def available_bytes(self):
         return common.DECODERS_DLL.novatel_framer_get_available_bytes(self._framer)
@@ -468,26 +577,87 @@ class Framer:
         Return:
             Number of bytes written
         """
-        return common.DECODERS_DLL.novatel_framer_write(self._framer, data, len(data))
+        return common.DECODERS_DLL.novatel_framer_write(self._framer, common.to_c_char_buffer(data), len(data))
 
     def read(self) -> tuple:
         """Read a frame from the internal buffer.
 
+        When zero_copy is set, the frame is a memoryview over the framer's read buffer. It is only valid until the
+        next call to read() or flush(), which overwrite the buffer in place. Call frame.tobytes() to detach a copy
+        that outlives the next read.
+
         Return:
             FrameData object, Log object
         """
         status = common.DECODERS_DLL.novatel_framer_read(
             self._framer, self._read_buf, self._read_buf_size, byref(self._meta_data))
-        return common.STATUS(status), self._read_buf.raw[:self._meta_data.length], self._meta_data
+        if self._zero_copy:
+            frame = self._read_view[:self._meta_data.length]
+        else:
+            frame = self._read_buf[:self._meta_data.length]
+        return common.STATUS(status), frame, self._meta_data
+
+    def read_many(self, max_frames: int = 1024, arena_size: int = common.MESSAGE_SIZE_MAX * 32) -> FrameBatch:
+        """Read as many frames as are available from the internal buffer into a preallocated arena.
+
+        Frames are written back to back into a single arena owned by the framer, and their statuses, offsets,
+        lengths and meta data into preallocated arrays, so no per-frame bytes, Enum or MetaDataStruct objects are
+        created. Reading stops when max_frames have been read, when the arena cannot hold another maximum sized
+        frame, or when the framer runs out of complete frames (BUFFER_EMPTY, INCOMPLETE or NULL_PROVIDED). Frames
+        left INCOMPLETE stay in the framer for the next call.
+
+        Args:
+            max_frames: Maximum number of frames to read.
+            arena_size: Size in bytes of the arena. It is raised to at least MESSAGE_SIZE_MAX.
+
+        Return:
+            FrameBatch holding the frames read. It is only valid until the next call to read_many().
+        """
+        arena_size = max(arena_size, common.MESSAGE_SIZE_MAX)
+        if self._arena is None or len(self._arena) < arena_size:
+            self._arena = create_string_buffer(arena_size)
+        if self._batch_frames < max_frames:
+            self._batch_frames = max_frames
+            self._batch_statuses = (c_uint32 * max_frames)()
+            self._batch_offsets = (c_uint32 * max_frames)()
+            self._batch_lengths = (c_uint32 * max_frames)()
+            self._batch_meta_data = (MetaDataStruct * max_frames)()
+
+        read = common.DECODERS_DLL.novatel_framer_read
+        stop_statuses = (common.STATUS.BUFFER_EMPTY.value, common.STATUS.INCOMPLETE.value,
+                         common.STATUS.NULL_PROVIDED.value)
+        statuses, offsets, lengths = self._batch_statuses, self._batch_offsets, self._batch_lengths
+        meta_data, meta_data_size = self._batch_meta_data, sizeof(MetaDataStruct)
+        arena_address, arena_size = addressof(self._arena), len(self._arena)
+
+        count = 0
+        offset = 0
+        while count < max_frames and arena_size - offset >= common.MESSAGE_SIZE_MAX:
+            status = read(self._framer, c_char_p(arena_address + offset), common.MESSAGE_SIZE_MAX,
+                          byref(meta_data, count * meta_data_size))
+            if status in stop_statuses:
+                break
+            length = meta_data[count].length
+            statuses[count] = status
+            offsets[count] = offset
+            lengths[count] = length
+            offset += length
+            count += 1
+
+        return FrameBatch(self._arena, statuses, offsets, lengths, meta_data, count)
 
     def flush(self) -> tuple:
         """Flush bytes from the internal buffer.
 
+        When zero_copy is set, the flushed bytes are returned as a memoryview with the same lifetime as read().
+
         Return:
             FrameData object, Log object
         """
         flushed_size = common.DECODERS_DLL.novatel_framer_flush(self._framer, self._read_buf, self._read_buf_size)
-        return self._read_buf.raw[:flushed_size], flushed_size
+        if self._zero_copy:
+            return self._read_view[:flushed_size], flushed_size
+        return self._read_buf[:flushed_size], flushed_size
 
 
 class Filter:
@@ -594,13 +764,13 @@ class HeaderDecoder:
 
     def __init__(self, json_db: Union[str, jsonreader.JsonReader] = None):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
-        self._decoder = DECODERS_DLL.novatel_header_decoder_init(json_db.get_dll_reference())
+        self._decoder = DECODERS_DLL.novatel_header_decoder_init(self._json_db.get_dll_reference())
 
     def __del__(self):
         if self._decoder:
@@ -618,7 +788,8 @@ class HeaderDecoder:
         """
         int_header = IntermediateHeader()
         status = common.STATUS(
-            DECODERS_DLL.novatel_header_decoder_decode(self._decoder, frame, byref(int_header), byref(meta_data)))
+            DECODERS_DLL.novatel_header_decoder_decode(
+                self._decoder, common.to_c_char_buffer(frame), byref(int_header), byref(meta_data)))
         return status, int_header
 
 
@@ -645,7 +816,7 @@ class MessageDecoder:
         self._decoder = None
         self.json_db = json_db
 
-        self._decoder = DECODERS_DLL.novatel_message_decoder_init(json_db.get_dll_reference())
+        self._decoder = DECODERS_DLL.novatel_message_decoder_init(self._json_db.get_dll_reference())
 
     def __del__(self):
         if self._decoder:
@@ -659,9 +830,9 @@ class MessageDecoder:
     @json_db.setter
     def json_db(self, json_db: Union[str, jsonreader.JsonReader] = None):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
@@ -682,7 +853,7 @@ class MessageDecoder:
         int_message = MessageDecoder.IntermediateMessage()
         status = common.STATUS(
             DECODERS_DLL.novatel_message_decoder_decode(self._decoder,
-                                                        frame,
+                                                        common.to_c_char_buffer(frame),
                                                         int_message.get_dll_reference(),
                                                         byref(meta_data)))
         return status, int_message
@@ -714,9 +885,9 @@ class Encoder:
     @json_db.setter
     def json_db(self, json_db: Union[str, jsonreader.JsonReader] = None):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
@@ -767,17 +938,173 @@ class Encoder:
         return status, message_data, message
 
 
+# Statuses of frames that read_batch skips and counts. The parser has consumed the frame, so reading can go on. Any
+# other status ends the batch, since it would recur on every read without consuming input.
+BATCH_SKIPPED_STATUSES = frozenset(status.value for status in (
+    common.STATUS.FAILURE, common.STATUS.UNKNOWN, common.STATUS.NO_DEFINITION, common.STATUS.NO_DEFINITION_EMBEDDED,
+    common.STATUS.MALFORMED_INPUT, common.STATUS.DECOMPRESSION_FAILURE))
+
+
+def _read_flattened_batch(read_native, handle, json_db: jsonreader.JsonReader, stop_status: common.STATUS,
+                          max_messages: int, refill=None) -> tuple:
+    """Reads up to max_messages FLATTENED_BINARY messages and stacks them into one structured array per type.
+
+    Args:
+        read_native: The native read function of the parser.
+        handle: The native parser handle.
+        json_db: JsonReader holding the message definitions.
+        stop_status: Status on which reading stops.
+        max_messages: Maximum number of messages to collect.
+        refill: Optional callable invoked on stop_status. Reading continues if it returns True.
+
+    Returns:
+        Tuple of the batch, the skipped frames and the status that ended the batch. The batch is a dictionary
+        mapping (message_id, message_crc) to a NumPy structured array with a 'header' field laid out as
+        OEM4BinaryHeader and a 'body' field laid out as the message definition structure. The skipped frames are a
+        dictionary mapping STATUS to the number of frames skipped with it, where SUCCESS counts responses. The status
+        is SUCCESS if max_messages were read.
+    """
+    import numpy as np
+
+    meta_data = MetaDataStruct()
+    message_data = MessageDataStruct()
+    header_size = sizeof(OEM4BinaryHeader)
+    success = common.STATUS.SUCCESS.value
+    stop = stop_status.value
+    buffers = {}
+    body_sizes = {}
+    skipped = {}
+    end_status = common.STATUS.SUCCESS
+
+    count = 0
+    while count < max_messages:
+        status = read_native(handle, byref(message_data), byref(meta_data))
+        if status == stop:
+            if refill is not None and refill():
+                continue
+            end_status = stop_status
+            break
+        if status in BATCH_SKIPPED_STATUSES or (status == success and meta_data.response):
+            skipped[status] = skipped.get(status, 0) + 1
+            continue
+        if status != success:
+            end_status = common.STATUS(status)
+            break
+
+        key = (meta_data.message_id, meta_data.message_crc)
+        buffer = buffers.get(key)
+        if buffer is None:
+            buffer = buffers[key] = bytearray()
+            body_sizes[key] = sizeof(json_db.get_message_definition_structure(*key))
+        buffer += string_at(message_data.get_header_address(), header_size)
+        buffer += string_at(message_data.get_body_address(), body_sizes[key])
+        count += 1
+
+    header_dtype = common.ctype_to_dtype(OEM4BinaryHeader)
+    batch = {}
+    for key, buffer in buffers.items():
+        body_dtype = json_db.get_message_dtype(*key)
+        batch[key] = np.frombuffer(buffer, dtype=np.dtype([('header', header_dtype), ('body', body_dtype)]))
+    return batch, {common.STATUS(status): number for status, number in skipped.items()}, end_status
+
+
+def explode(messages, array_field: str = None) -> dict:
+    """Explodes messages with a variable-length array of sub-structures (e.g. RANGE or TRACKSTAT) into a tidy table
+    with one row per array element in use. Requires NumPy.
+
+    Each row holds the index of its message, the GPS week and milliseconds of the message header, the scalar fields
+    of the message body repeated for every element, and the fields of the element. Fields of nested structures
+    within an element are named 'field.sub_field', and element fields whose names clash with another column are
+    named 'array_field.field'. Only the elements counted by the array's _length field are included.
+
+    Args:
+        messages: A structured array of one message type as returned by read_batch, or an iterable of Message
+            objects of one message type.
+        array_field: Name of the array to explode. Defaults to the message's only variable-length array of
+            sub-structures.
+
+    Returns:
+        Dictionary mapping column names to NumPy arrays of equal length.
+    """
+    import numpy as np
+
+    if not isinstance(messages, np.ndarray):
+        messages = list(messages)
+        if not messages:
+            return {}
+        dtype = np.dtype([('header', common.ctype_to_dtype(OEM4BinaryHeader)),
+                          ('body', common.ctype_to_dtype(type(messages[0].body)))])
+        messages = np.frombuffer(b''.join(bytes(message.header) + bytes(message.body) for message in messages),
+                                 dtype=dtype)
+
+    body = messages['body']
+    names = body.dtype.names
+    if array_field is None:
+        candidates = [name for name in names if f'{name}_length' in names and body.dtype[name].subdtype
+                      and body.dtype[name].subdtype[0].names]
+        if len(candidates) != 1:
+            raise ValueError(f'Expected a single variable-length array of sub-structures, found {candidates}')
+        array_field = candidates[0]
+    length_field = f'{array_field}_length'
+    if length_field not in names:
+        raise ValueError(f'{array_field} is not a variable-length array')
+
+    elements = body[array_field]
+    lengths = np.minimum(body[length_field], elements.shape[1]).astype(np.intp)
+    in_use = elements[np.arange(elements.shape[1]) < lengths[:, np.newaxis]]
+
+    table = {
+        'message_index': np.repeat(np.arange(len(body)), lengths),
+        'week': np.repeat(messages['header']['week'], lengths),
+        'milliseconds': np.repeat(messages['header']['milliseconds'], lengths),
+    }
+    for name in names:
+        if name in (array_field, length_field) or name.startswith('_') or body.dtype[name].shape or \
+                body.dtype[name].names:
+            continue
+        table[name] = np.repeat(body[name], lengths)
+
+    def add_element_fields(values, prefix: str):
+        for name in values.dtype.names:
+            if name.startswith('_'):
+                continue
+            if values.dtype[name].names:
+                add_element_fields(values[name], f'{prefix}{name}.')
+                continue
+            column = f'{prefix}{name}'
+            table[f'{array_field}.{column}' if column in table else column] = values[name]
+
+    add_element_fields(in_use, '')
+    return table
+
+
 class Parser:
     def __init__(self, json_db: Union[str, jsonreader.JsonReader] = None,
-                 encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII):
+                 encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII, recycle: bool = False):
         """Parser class for NovAtel messages.
+
+        Args:
+            json_db: JSON database path or JsonReader.
+            encode_format: Format to encode messages to.
+            recycle: Reuse the same MetaDataStruct and MessageDataStruct for every read instead of allocating new
+                ones. Each read then overwrites the structures returned by the previous one, so call snapshot() on
+                any structure that needs to be kept.
         """
         self._parser = None
         self.json_db = json_db
+        self.recycle = recycle
+        self._meta_data = MetaDataStruct()
+        self._message_data = MessageDataStruct()
+        self.batch_skipped = dict()  # STATUS -> number of frames the last read_batch skipped
+        self.batch_status = None  # The status that ended the last read_batch
 
         self._parser = DECODERS_DLL.novatel_parser_init(self._json_db.get_dll_reference())
         self._encode_buffer_size = common.MESSAGE_SIZE_MAX
         self._encode_buffer = create_string_buffer(self._encode_buffer_size)
+        self._decompress_rangecmp = DECODERS_DLL.novatel_parser_get_decompress_rangecmp(self._parser)
+        self._ignore_abbrev_ascii_responses = DECODERS_DLL.novatel_parser_get_ignore_abbrev_ascii_responses(
+            self._parser)
+        self._return_unknownbytes = DECODERS_DLL.novatel_parser_get_return_unknownbytes(self._parser)
         self.encode_format = encode_format
 
         self.filter = Filter()
@@ -810,9 +1137,9 @@ class Parser:
     @json_db.setter
     def json_db(self, json_db: Union[str, jsonreader.JsonReader] = None):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
@@ -823,48 +1150,52 @@ class Parser:
     def decompress_rangecmp(self):
         """
         """
-        return DECODERS_DLL.novatel_parser_get_decompress_rangecmp(self._parser)
+        return self._decompress_rangecmp
 
     @decompress_rangecmp.setter
     def decompress_rangecmp(self, decompress: bool):
         """
         """
+        self._decompress_rangecmp = decompress
         DECODERS_DLL.novatel_parser_set_decompress_rangecmp(self._parser, decompress)
 
     @property
     def ignore_abbrev_ascii_responses(self):
         """
         """
-        return DECODERS_DLL.novatel_parser_get_ignore_abbrev_ascii_responses(self._parser)
+        return self._ignore_abbrev_ascii_responses
 
     @ignore_abbrev_ascii_responses.setter
     def ignore_abbrev_ascii_responses(self, ignore: bool):
         """
         """
+        self._ignore_abbrev_ascii_responses = ignore
         DECODERS_DLL.novatel_parser_set_ignore_abbrev_ascii_responses(self._parser, ignore)
 
     @property
     def return_unknownbytes(self):
         """
         """
-        return DECODERS_DLL.novatel_parser_get_return_unknownbytes(self._parser)
+        return self._return_unknownbytes
 
     @return_unknownbytes.setter
     def return_unknownbytes(self, unknownbytes: bool):
         """
         """
+        self._return_unknownbytes = unknownbytes
         DECODERS_DLL.novatel_parser_set_return_unknownbytes(self._parser, unknownbytes)
 
     @property
     def encode_format(self):
         """
         """
-        return common.ENCODEFORMAT(DECODERS_DLL.novatel_parser_get_encodeformat(self._parser))
+        return self._encode_format
 
     @encode_format.setter
     def encode_format(self, encode_format: common.ENCODEFORMAT):
         """
         """
+        self._encode_format = encode_format
         DECODERS_DLL.novatel_parser_set_encodeformat(self._parser, encode_format.value)
 
     def _internal_frame_buffer(self):
@@ -875,17 +1206,19 @@ class Parser:
     def write(self, data: bytes):
         """
         """
-        return DECODERS_DLL.novatel_parser_write(self._parser, data, len(data))
+        return DECODERS_DLL.novatel_parser_write(self._parser, common.to_c_char_buffer(data), len(data))
 
     def read(self):
         """
         """
-        meta_data = MetaDataStruct()
-        message_data = MessageDataStruct()
+        if self.recycle:
+            meta_data, message_data = self._meta_data, self._message_data
+        else:
+            meta_data, message_data = MetaDataStruct(), MessageDataStruct()
         status = common.STATUS(DECODERS_DLL.novatel_parser_read(self._parser, byref(message_data), byref(meta_data)))
 
         message = None
-        if status == common.STATUS.SUCCESS and self.encode_format == common.ENCODEFORMAT.FLATTENED_BINARY:
+        if status is common.STATUS.SUCCESS and self._encode_format is common.ENCODEFORMAT.FLATTENED_BINARY:
             # If we are encoding to FLATTENED_BINARY, we can define a new type and create an instance of it here
             if meta_data.response:
                 if message_data.body is None:
@@ -905,6 +1238,26 @@ class Parser:
 
         return status, meta_data, message_data, message
 
+    def read_batch(self, max_messages: int = 4096) -> dict:
+        """Read up to max_messages FLATTENED_BINARY messages into NumPy structured arrays, one per message type.
+
+        No Message object is created per message: each decoded header and body is copied straight into a buffer
+        per (message_id, message_crc), which is then viewed as a structured array. Responses and frames with one of
+        the BATCH_SKIPPED_STATUSES are skipped and counted in batch_skipped. Any other status ends the batch early
+        and is kept in batch_status, which is otherwise the status that ended the batch normally. Requires NumPy.
+
+        Args:
+            max_messages: Maximum number of messages to read.
+
+        Return:
+            Dictionary mapping (message_id, message_crc) to a structured array with 'header' and 'body' fields.
+        """
+        if self._encode_format is not common.ENCODEFORMAT.FLATTENED_BINARY:
+            raise ValueError(f'read_batch requires the FLATTENED_BINARY encode format, not {self._encode_format.name}')
+        batch, self.batch_skipped, self.batch_status = _read_flattened_batch(
+            DECODERS_DLL.novatel_parser_read, self._parser, self._json_db, common.STATUS.BUFFER_EMPTY, max_messages)
+        return batch
+
     def flush(self):
         """Flush bytes from the internal buffer.
 
@@ -921,15 +1274,33 @@ class FileParser:
     """
 
     def __init__(self, json_db: Union[str, jsonreader.JsonReader] = None,
-                 encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII, input_file: str = None):
-        """
+                 encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII, input_file: str = None,
+                 recycle: bool = False):
+        """Initializer.
+
+        Args:
+            json_db: JSON database path or JsonReader.
+            encode_format: Format to encode messages to.
+            input_file: File to parse.
+            recycle: Reuse the same MetaDataStruct and MessageDataStruct for every read instead of allocating new
+                ones. Each read then overwrites the structures returned by the previous one, so call snapshot() on
+                any structure that needs to be kept.
         """
         self._fileparser = None
         self.json_db = json_db
+        self.recycle = recycle
+        self._meta_data = MetaDataStruct()
+        self._message_data = MessageDataStruct()
+        self.batch_skipped = dict()  # STATUS -> number of frames the last read_batch skipped
+        self.batch_status = None  # The status that ended the last read_batch
 
         self._fileparser = DECODERS_DLL.novatel_fileparser_init(self._json_db.get_dll_reference())
         self._encode_buffer_size = common.MESSAGE_SIZE_MAX
         self._encode_buffer = create_string_buffer(self._encode_buffer_size)
+        self._decompress_rangecmp = DECODERS_DLL.novatel_fileparser_get_decompress_rangecmp(self._fileparser)
+        self._ignore_abbrev_ascii_responses = DECODERS_DLL.novatel_fileparser_get_ignore_abbrev_ascii_responses(
+            self._fileparser)
+        self._return_unknownbytes = DECODERS_DLL.novatel_fileparser_get_return_unknownbytes(self._fileparser)
         self.encode_format = encode_format
 
         self.filter = Filter()
@@ -969,9 +1340,9 @@ class FileParser:
     @json_db.setter
     def json_db(self, json_db: Union[str, jsonreader.JsonReader] = None):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
@@ -982,48 +1353,52 @@ class FileParser:
     def decompress_rangecmp(self):
         """
         """
-        return DECODERS_DLL.novatel_fileparser_get_decompress_rangecmp(self._fileparser)
+        return self._decompress_rangecmp
 
     @decompress_rangecmp.setter
     def decompress_rangecmp(self, decompress: bool):
         """
         """
+        self._decompress_rangecmp = decompress
         DECODERS_DLL.novatel_fileparser_set_decompress_rangecmp(self._fileparser, decompress)
 
     @property
     def ignore_abbrev_ascii_responses(self):
         """
         """
-        return DECODERS_DLL.novatel_fileparser_get_ignore_abbrev_ascii_responses(self._fileparser)
+        return self._ignore_abbrev_ascii_responses
 
     @ignore_abbrev_ascii_responses.setter
     def ignore_abbrev_ascii_responses(self, ignore: bool):
         """
         """
+        self._ignore_abbrev_ascii_responses = ignore
         DECODERS_DLL.novatel_fileparser_set_ignore_abbrev_ascii_responses(self._fileparser, ignore)
 
     @property
     def return_unknownbytes(self):
         """
         """
-        return DECODERS_DLL.novatel_fileparser_get_return_unknownbytes(self._fileparser)
+        return self._return_unknownbytes
 
     @return_unknownbytes.setter
     def return_unknownbytes(self, unknownbytes: bool):
         """
         """
+        self._return_unknownbytes = unknownbytes
         DECODERS_DLL.novatel_fileparser_set_return_unknownbytes(self._fileparser, unknownbytes)
 
     @property
     def encode_format(self):
         """
         """
-        return common.ENCODEFORMAT(DECODERS_DLL.novatel_fileparser_get_encodeformat(self._fileparser))
+        return self._encode_format
 
     @encode_format.setter
     def encode_format(self, encode_format: common.ENCODEFORMAT):
         """
         """
+        self._encode_format = encode_format
         DECODERS_DLL.novatel_fileparser_set_encodeformat(self._fileparser, encode_format.value)
 
     def _internal_frame_buffer(self):
@@ -1054,13 +1429,15 @@ class FileParser:
     def read(self):
         """
         """
-        message_data = MessageDataStruct()
-        meta_data = MetaDataStruct()
+        if self.recycle:
+            meta_data, message_data = self._meta_data, self._message_data
+        else:
+            meta_data, message_data = MetaDataStruct(), MessageDataStruct()
         status = common.STATUS(
             DECODERS_DLL.novatel_fileparser_read(self._fileparser, byref(message_data), byref(meta_data)))
 
         message = None
-        if status == common.STATUS.SUCCESS and self.encode_format == common.ENCODEFORMAT.FLATTENED_BINARY:
+        if status is common.STATUS.SUCCESS and self._encode_format is common.ENCODEFORMAT.FLATTENED_BINARY:
             # If we are encoding to FLATTENED_BINARY, we can define a new type and create an instance of it here
             if meta_data.response:
                 message = Response(
@@ -1076,6 +1453,27 @@ class FileParser:
 
         return status, meta_data, message_data, message
 
+    def read_batch(self, max_messages: int = 4096) -> dict:
+        """Read up to max_messages FLATTENED_BINARY messages into NumPy structured arrays, one per message type.
+
+        No Message object is created per message: each decoded header and body is copied straight into a buffer
+        per (message_id, message_crc), which is then viewed as a structured array. Responses and frames with one of
+        the BATCH_SKIPPED_STATUSES are skipped and counted in batch_skipped. Any other status ends the batch early
+        and is kept in batch_status, which is otherwise the status that ended the batch normally. Requires NumPy.
+
+        Args:
+            max_messages: Maximum number of messages to read.
+
+        Return:
+            Dictionary mapping (message_id, message_crc) to a structured array with 'header' and 'body' fields.
+        """
+        if self._encode_format is not common.ENCODEFORMAT.FLATTENED_BINARY:
+            raise ValueError(f'read_batch requires the FLATTENED_BINARY encode format, not {self._encode_format.name}')
+        batch, self.batch_skipped, self.batch_status = _read_flattened_batch(
+            DECODERS_DLL.novatel_fileparser_read, self._fileparser, self._json_db, common.STATUS.STREAM_EMPTY,
+            max_messages)
+        return batch
+
     def flush(self):
         """Flush bytes from the internal buffer.
 
@@ -1087,6 +1485,274 @@ class FileParser:
         return self._encode_buffer.raw[:flushed_size], flushed_size
 
 
+def iter_file_frames(input_file: str, start: int = 0, end: int = None, read_size: int = 1024 * 1024):
+    """Frames a region of a file through a memory map, tracking the offset of every frame.
+
+    Framing starts at the first byte of the region, so the framer resynchronizes on the first sync bytes it finds and
+    reports anything before them as unknown bytes. Every frame starting before the end of the region is yielded,
+    including one that straddles the end.
+
+    Args:
+        input_file: File to frame.
+        start: Offset of the first byte of the region.
+        end: Offset just past the region. Defaults to the end of the file.
+        read_size: Number of bytes of the mapping handed to the framer at a time.
+
+    Yields:
+        (offset, status, frame, meta_data) for every frame and run of unknown bytes. The frame is a memoryview and
+        the meta data is recycled; both are only valid until the next frame is yielded.
+    """
+    framer = Framer(report_unknown_bytes=True, zero_copy=True)
+    stop_statuses = (common.STATUS.BUFFER_EMPTY, common.STATUS.INCOMPLETE, common.STATUS.NULL_PROVIDED)
+
+    with file_stream.MemoryMappedFileStream(input_file, read_size) as stream:
+        end = stream.stream_length if end is None else min(end, stream.stream_length)
+        stream.seek(start)
+        offset = start
+        while offset < end:
+            stream_status, pending = stream.read()
+            while offset < end:
+                if pending:
+                    pending = pending[framer.write(pending):]
+                status, frame, meta_data = framer.read()
+                if status in stop_statuses:
+                    if pending:
+                        continue
+                    break
+                yield offset, status, frame, meta_data
+                offset += len(frame)
+            pending.release()
+            if stream_status.eos:
+                break
+
+
+def _first_timed_frame(input_file: str, header_decoder: HeaderDecoder, offset: int) -> tuple:
+    """Finds the first frame at or after an offset of a file whose header carries a GPS time.
+
+    Args:
+        input_file: File to search.
+        header_decoder: HeaderDecoder used to read the time of each frame.
+        offset: Offset to start framing at.
+
+    Returns:
+        Tuple of the offset of the frame and its GPS time in milliseconds, or None if no such frame follows.
+    """
+    for frame_offset, status, frame, meta_data in iter_file_frames(input_file, offset,
+                                                                   read_size=common.MESSAGE_SIZE_MAX):
+        if status != common.STATUS.SUCCESS:
+            continue
+        if header_decoder.decode(frame, meta_data)[0] != common.STATUS.SUCCESS:
+            continue
+        if meta_data.time_status == common.TIME_STATUS.UNKNOWN.value:
+            continue
+        return frame_offset, meta_data.week * common.MILLISECONDS_IN_WEEK + meta_data.milliseconds
+    return None
+
+
+class MappedFileParser(Parser):
+    """FileParser counterpart that reads its input file through a memory map.
+
+    The native FileParser can only pull from an InputFileStream, which reads the file in small chunks through an
+    intermediate buffer. MappedFileParser instead maps the file and writes regions of the mapping straight into a
+    native Parser, so the only copy made is the parser's own. It otherwise behaves like FileParser: read() returns
+    STREAM_EMPTY once the whole file has been parsed and iteration stops there.
+    """
+
+    def __init__(self, json_db: Union[str, jsonreader.JsonReader] = None,
+                 encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII, input_file: str = None,
+                 window_size: int = None, sequential: bool = True, recycle: bool = False):
+        """Initializer.
+
+        Args:
+            json_db: JSON database path or JsonReader.
+            encode_format: Format to encode messages to.
+            input_file: File to parse.
+            window_size: Number of bytes of the mapping handed to the parser at a time. None hands over the whole
+                mapping and lets the parser take as much as it can hold on each write.
+            sequential: Advise the kernel that the file is read sequentially.
+            recycle: Reuse the same MetaDataStruct and MessageDataStruct for every read. See Parser.
+        """
+        super().__init__(json_db, encode_format, recycle)
+        self._window_size = window_size
+        self._sequential = sequential
+        self._stream = None
+        self._pending = memoryview(b'')
+        self._selection = None
+        self._input_file = None
+        if input_file:
+            self.input_file = input_file
+
+    def __next__(self):
+        """
+        """
+        result = self.read()
+        if result[0] == common.STATUS.STREAM_EMPTY:
+            raise StopIteration()
+        return result
+
+    @property
+    def input_file(self):
+        """
+        """
+        return self._input_file
+
+    @input_file.setter
+    def input_file(self, input_file: str):
+        """
+        """
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f'File does not exist: {input_file}')
+
+        self._drain()
+        if self._stream:
+            self._stream.close()
+        self._input_file = input_file
+        self._stream = file_stream.MemoryMappedFileStream(input_file, self._window_size, self._sequential)
+
+    @property
+    def window_size(self):
+        """
+        """
+        return self._window_size
+
+    @window_size.setter
+    def window_size(self, window_size: int):
+        """
+        """
+        self._window_size = window_size
+        if self._stream:
+            self._stream.window_size = window_size
+
+    @property
+    def percent_read(self):
+        """Percentage of the file that has been handed to the parser.
+        """
+        if not self._stream or not self._stream.stream_length:
+            return 100
+        return 100 * (self._stream.tell() - len(self._pending)) // self._stream.stream_length
+
+    def _feed(self) -> bool:
+        """Writes the next region of the mapping into the parser.
+
+        Return:
+            False once the whole file has been written. True while bytes remain, even if the parser's buffer is full
+            and none could be written this time.
+        """
+        if not self._pending:
+            if not self._stream:
+                return False
+            if self._selection is not None:
+                entry = next(self._selection, None)
+                if entry is None:
+                    return False
+                self._stream.seek(entry.offset)
+                _, self._pending = self._stream.read(entry.length)
+            else:
+                _, self._pending = self._stream.read()
+            if not self._pending:
+                return False
+
+        written = self.write(self._pending)
+        self._pending = self._pending[written:]
+        return True
+
+    def _drain(self):
+        """Discards any bytes still held by the parser or waiting to be written to it.
+        """
+        self._pending = memoryview(b'')
+        while self.flush()[1]:
+            pass
+
+    def reset(self):
+        """Rewinds to the start of the file and clears any frame selection.
+        """
+        self.seek(0)
+
+    def seek(self, offset: int):
+        """Moves parsing to an offset of the file.
+
+        Anything still held by the parser is discarded, any frame selection is cleared and the parser resynchronizes
+        on the first frame at or after the offset.
+
+        Args:
+            offset: Offset of the file to resume parsing at.
+        """
+        self._drain()
+        self._selection = None
+        if self._stream:
+            self._stream.seek(offset)
+
+    def seek_time(self, week: int, seconds: float) -> int:
+        """Moves parsing to the first message at or after a GPS time.
+
+        The file is bisected by byte offset. At each probe the framer resynchronizes on the next valid frame and its
+        header time is compared with the target, so only a few frames are read however large the file is. The file
+        must be time-ordered; frames without a known time (e.g. responses) are skipped while probing.
+
+        Args:
+            week: GPS week of the target time.
+            seconds: GPS seconds into the week of the target time.
+
+        Returns:
+            The offset parsing resumes at. It is the size of the file if every message is earlier than the target.
+        """
+        if not self._stream:
+            raise IOError('No input file has been set.')
+
+        target = week * common.MILLISECONDS_IN_WEEK + seconds * 1000
+        header_decoder = HeaderDecoder(self._json_db)
+        low, high = 0, self._stream.stream_length
+        # Invariant: every timed frame starting before low is earlier than the target, and the first timed frame at
+        # or after high (if any) is not.
+        while low < high:
+            middle = (low + high) // 2
+            found = _first_timed_frame(self._input_file, header_decoder, middle)
+            if found is None or found[1] >= target:
+                high = middle
+            else:
+                low = found[0] + 1
+
+        found = _first_timed_frame(self._input_file, header_decoder, low)
+        offset = found[0] if found else self._stream.stream_length
+        self.seek(offset)
+        return offset
+
+    def select_frames(self, entries):
+        """Restricts parsing to a set of frames of the file, such as those selected from a FrameIndex.
+
+        Only the bytes of the selected frames are handed to the parser, in the order given, so the rest of the file is
+        never read.
+
+        Args:
+            entries: Iterable of objects with offset and length attributes, e.g. FrameIndexEntry. None goes back to
+                parsing the whole file from the current position.
+        """
+        self._drain()
+        self._selection = iter(entries) if entries is not None else None
+
+    def read(self):
+        """
+        """
+        while True:
+            result = super().read()
+            if result[0] != common.STATUS.BUFFER_EMPTY:
+                return result
+            if not self._feed():
+                return (common.STATUS.STREAM_EMPTY,) + result[1:]
+
+    def read_batch(self, max_messages: int = 4096) -> dict:
+        """Read up to max_messages FLATTENED_BINARY messages into NumPy structured arrays, one per message type.
+
+        See Parser.read_batch.
+        """
+        if self._encode_format is not common.ENCODEFORMAT.FLATTENED_BINARY:
+            raise ValueError(f'read_batch requires the FLATTENED_BINARY encode format, not {self._encode_format.name}')
+        batch, self.batch_skipped, self.batch_status = _read_flattened_batch(
+            DECODERS_DLL.novatel_parser_read, self._parser, self._json_db, common.STATUS.BUFFER_EMPTY, max_messages,
+            refill=self._feed)
+        return batch
+
+
 class Commander:
     """Encoder class for decoded NovAtel messages.
     """
@@ -1094,9 +1760,9 @@ class Commander:
     def __init__(self, json_db: Union[str, jsonreader.JsonReader] = None,
                  encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
@@ -1118,9 +1784,9 @@ class Commander:
     @json_db.setter
     def json_db(self, json_db: Union[str, jsonreader.JsonReader] = None):
         if json_db is None:
-            self._json_db = jsonreader.JsonReader()
+            self._json_db = jsonreader.get_json_reader()
         elif isinstance(json_db, str):
-            self._json_db = jsonreader.JsonReader(json_db)
+            self._json_db = jsonreader.get_json_reader(json_db)
         elif isinstance(json_db, jsonreader.JsonReader):
             self._json_db = json_db
 
@@ -0,0 +1,217 @@
+"""
+Copyright 2023 NovAtel Inc.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Module Description: Holds classes and functions for parsing files across multiple processes.
+"""
+import multiprocessing
+import os
+from ctypes import sizeof
+from typing import Callable, Union
+
+from novatel_edie.decoders import common, jsonreader, novatel
+
+# Number of bytes of the mapping handed to a shard's framer at a time.
+SHARD_READ_SIZE = 1024 * 1024
+
+# Per-process state of pool workers, set up once by _init_worker.
+_worker_json_db = None
+_worker_encode_format = None
+_worker_configure = None
+_worker_func = None
+
+
+def _init_worker(json_db: jsonreader.JsonReader, encode_format: common.ENCODEFORMAT, configure: Callable,
+                 func: Callable):
+    """Sets up the per-process state of a worker.
+
+    Forked workers inherit the parent's preloaded JsonReader as is. Spawned workers receive it pickled, which carries
+    its compact definitions so the JSON database is not parsed again on the Python side.
+    """
+    global _worker_json_db, _worker_encode_format, _worker_configure, _worker_func
+    _worker_json_db = json_db
+    _worker_encode_format = encode_format
+    _worker_configure = configure
+    _worker_func = func
+
+
+def _parse_shard(shard: tuple) -> tuple:
+    """Parses the frames that start within a byte range of a file.
+
+    The shard's framer starts at the first byte of the range, so it resynchronizes on the first sync bytes it finds
+    and reports anything before them as unknown bytes. Every frame starting before the end of the range belongs to
+    the shard, including one that straddles the end; framing stops at the first frame that starts at or after it.
+
+    Args:
+        shard: Tuple of the input file, start offset and end offset.
+
+    Returns:
+        Tuple of the shard start, the decoded items as (offset, result) pairs and the offset just past the last frame
+        owned by the shard.
+    """
+    input_file, start, end = shard
+    parser = novatel.Parser(_worker_json_db, _worker_encode_format)
+    if _worker_configure:
+        _worker_configure(parser)
+
+    items = []
+    boundary = start
+    for offset, framer_status, frame, _ in novatel.iter_file_frames(input_file, start, end, SHARD_READ_SIZE):
+        if framer_status == common.STATUS.SUCCESS:
+            parser.write(frame)
+            for status, meta_data, message_data, message in parser:
+                items.append((offset, _worker_result(status, meta_data, message_data, message)))
+        boundary = offset + len(frame)
+
+    return start, items, boundary
+
+
+def _worker_result(status: common.STATUS, meta_data: common.MetaDataStruct, message_data: common.MessageDataStruct,
+                   message: novatel.Message):
+    """Converts a parsed message into a picklable result.
+    """
+    if _worker_func:
+        return _worker_func(status, meta_data, message_data, message)
+    return status.value, meta_data, message_data.message, message_data.header, message_data.body
+
+
+class ParallelFileParser:
+    """Parses a file across multiple processes.
+
+    The file is split into byte ranges (shards) that are framed, decoded and encoded by a pool of worker processes,
+    each with its own Parser. Each worker resynchronizes on NovAtel sync bytes at the start of its shard and owns the
+    frames that start within it, including one that straddles the end of the shard. When results are merged, anything
+    a worker decoded before the end of the last frame owned by the previous shard is discarded, so every frame is
+    returned exactly once.
+    """
+
+    def __init__(self, input_file: str, json_db: Union[str, jsonreader.JsonReader] = None,
+                 encode_format: common.ENCODEFORMAT = common.ENCODEFORMAT.ASCII, processes: int = None,
+                 shard_size: int = 64 * 1024 * 1024, configure: Callable = None, start_method: str = None):
+        """Initializer.
+
+        Args:
+            input_file: File to parse.
+            json_db: JSON database path or JsonReader. It is loaded once in this process and shared with the workers.
+            encode_format: Format to encode messages to.
+            processes: Number of worker processes. Defaults to the number of CPUs.
+            shard_size: Size in bytes of the range of the file given to a worker at a time. It is raised to at least
+                MESSAGE_SIZE_MAX.
+            configure: Picklable function called with each worker's Parser before parsing, e.g. to set up its
+                filter.
+            start_method: multiprocessing start method. Defaults to the platform default.
+        """
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f'File does not exist: {input_file}')
+
+        self.input_file = input_file
+        self._json_db = json_db
+        self.encode_format = encode_format
+        self.processes = processes
+        self.shard_size = max(shard_size, common.MESSAGE_SIZE_MAX)
+        self.configure = configure
+        self.start_method = start_method
+
+    def __iter__(self):
+        return self.map()
+
+    @property
+    def json_db(self):
+        if isinstance(self._json_db, jsonreader.JsonReader):
+            return self._json_db.json_db_filepath
+        return self._json_db
+
+    def _shards(self) -> list:
+        """Splits the file into byte ranges.
+        """
+        file_size = os.path.getsize(self.input_file)
+        return [(self.input_file, start, min(start + self.shard_size, file_size))
+                for start in range(0, file_size, self.shard_size)]
+
+    def map(self, func: Callable = None, ordered: bool = True):
+        """Parses the file and yields one result per message.
+
+        Args:
+            func: Picklable function called in the worker processes for each message with the same
+                (status, meta_data, message_data, message) tuple Parser.read returns. Its picklable return values are
+                yielded. If None, (status, meta_data, message, decoded) tuples are yielded, where message is the
+                encoded message bytes and decoded is the Message or Response for FLATTENED_BINARY, otherwise None.
+            ordered: Yield results in file order. Otherwise results are yielded as soon as their shard is done and
+                their ownership is settled, which suits aggregate jobs.
+
+        Yields:
+            One result per parsed message.
+        """
+        json_db = jsonreader.get_json_reader(self._json_db)
+        context = multiprocessing.get_context(self.start_method)
+        if context.get_start_method() == 'fork':
+            # Load the database once here so every worker inherits it instead of loading its own. Workers only build
+            # Message objects, and so only need the ctypes structures, when decoding to FLATTENED_BINARY.
+            json_db.preload(structures=self.encode_format == common.ENCODEFORMAT.FLATTENED_BINARY)
+
+        # Results are only rebuilt into Message and Response objects when they are FLATTENED_BINARY bodies.
+        decode_db = json_db if func is None and self.encode_format == common.ENCODEFORMAT.FLATTENED_BINARY else None
+        shards = self._shards()
+        with context.Pool(self.processes, _init_worker, (json_db, self.encode_format, self.configure, func)) as pool:
+            if ordered:
+                boundary = 0
+                for _, items, shard_boundary in pool.imap(_parse_shard, shards):
+                    for offset, result in items:
+                        if offset >= boundary:
+                            yield self._result(decode_db, func, result)
+                    boundary = max(boundary, shard_boundary)
+            else:
+                yield from self._map_unordered(pool.imap_unordered(_parse_shard, shards), shards, decode_db, func)
+
+    def _map_unordered(self, shard_results, shards: list, json_db: jsonreader.JsonReader, func: Callable):
+        """Yields shard results as they complete.
+
+        A shard's items that start at least MESSAGE_SIZE_MAX bytes into it cannot lie within a frame owned by the
+        previous shard, so they are yielded right away. The others are held until the previous shard is done.
+        """
+        shard_index = {start: index for index, (_, start, _) in enumerate(shards)}
+        boundaries = {}
+        held = {}
+
+        for start, items, shard_boundary in shard_results:
+            index = shard_index[start]
+            boundaries[index] = shard_boundary
+            settled = start + common.MESSAGE_SIZE_MAX if index else 0
+            held[index] = [(offset, result) for offset, result in items if offset < settled]
+            for offset, result in items:
+                if offset >= settled:
+                    yield self._result(json_db, func, result)
+
+            for candidate in (index, index + 1):
+                if candidate in held and (candidate == 0 or candidate - 1 in boundaries):
+                    boundary = boundaries[candidate - 1] if candidate else 0
+                    for offset, result in held.pop(candidate):
+                        if offset >= boundary:
+                            yield self._result(json_db, func, result)
+
+    @staticmethod
+    def _result(json_db: jsonreader.JsonReader, func: Callable, result):
+        """Rebuilds a worker result in the parent process.
+        """
+        if func:
+            return result
+
+        status, meta_data, message, header, body = result
+        status = common.STATUS(status)
+        decoded = None
+        if json_db and status == common.STATUS.SUCCESS:
+            if meta_data.response:
+                decoded = novatel.Response(
+                    header=novatel.OEM4BinaryHeader.from_buffer_copy(header) if header else novatel.OEM4BinaryHeader(),
+                    body=json_db.convert_response_to_structure(body[:-4] if body else message))
+            else:
+                structure = json_db.get_message_definition_structure(meta_data.message_id, meta_data.message_crc)
+                decoded = novatel.Message(
+                    header=novatel.OEM4BinaryHeader.from_buffer_copy(header),
+                    body=structure.from_buffer_copy(body[:sizeof(structure)]))
+        return status, meta_data, message, decoded
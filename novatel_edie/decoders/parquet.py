@@ -0,0 +1,358 @@
+"""
+Copyright 2023 NovAtel Inc.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Module Description: Holds classes and functions for writing decoded messages to Arrow tables and Parquet files.
+"""
+import os
+from typing import Callable, Iterable, Union
+
+from novatel_edie.decoders import common, jsonreader, novatel
+
+# Number of messages per Parquet row group.
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+# Bytes of decoded messages buffered across all message types before the buffer holding the most bytes is written out.
+PARQUET_BUFFER_SIZE = 64 * 1024 * 1024
+
+# Header fields written as columns ahead of the message fields.
+HEADER_COLUMNS = ('week', 'milliseconds', 'time_status', 'status', 'port', 'sequence')
+
+
+def _column(json_db: jsonreader.JsonReader, dtype: 'numpy.dtype', enum_id: str = None) -> tuple:
+    """Plans the conversion of one NumPy field to an Arrow column.
+
+    Returns:
+        Tuple of the Arrow type and a function converting a NumPy array of the field to an Arrow array.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    if dtype.names:
+        fields = _columns(json_db, dtype)
+        arrow_type = pa.struct([(name, field_type) for name, field_type, _ in fields])
+        return arrow_type, lambda values: pa.StructArray.from_arrays(
+            [convert(values[name], values) for name, _, convert in fields], fields=list(arrow_type))
+    if dtype.subdtype:
+        element_dtype, shape = dtype.subdtype
+        size = int(np.prod(shape))
+        element_type, convert_elements = _column(json_db, element_dtype)
+        return pa.list_(element_type, size), lambda values: pa.FixedSizeListArray.from_arrays(
+            convert_elements(values.reshape(-1)), size)
+    if enum_id is not None:
+        _, names = json_db.decode_enum(enum_id, np.empty(0), codes=True)
+        dictionary = pa.array(names, type=pa.string())
+
+        def convert_enum(values):
+            codes, _ = json_db.decode_enum(enum_id, values, codes=True)
+            return pa.DictionaryArray.from_arrays(pa.array(codes, mask=codes < 0), dictionary)
+        return pa.dictionary(pa.int32(), pa.string()), convert_enum
+    if dtype.kind == 'S':
+        # NumPy strips the trailing NULs of the fixed-length strings.
+        return pa.string(), lambda values: pa.array(values, type=pa.binary()).cast(pa.string())
+    return pa.from_numpy_dtype(dtype), lambda values: pa.array(np.ascontiguousarray(values))
+
+
+def _variable_column(json_db: jsonreader.JsonReader, dtype: 'numpy.dtype', length_field: str) -> tuple:
+    """Plans the conversion of a variable-length array field to an Arrow list column of only the elements in use.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    element_dtype, (size,) = dtype.subdtype
+    element_type, convert_elements = _column(json_db, element_dtype)
+
+    def convert(values, parents):
+        lengths = np.minimum(parents[length_field], size)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        elements = values[np.arange(size) < lengths[:, np.newaxis]]
+        return pa.ListArray.from_arrays(pa.array(offsets), convert_elements(elements))
+    return pa.list_(element_type), convert
+
+
+def _field_converter(convert_field: Callable) -> Callable:
+    """Adapts the conversion of a single field to the (values, parents) signature of the struct column conversions.
+    """
+    return lambda values, parents: convert_field(values)
+
+
+def _columns(json_db: jsonreader.JsonReader, dtype: 'numpy.dtype', enum_fields: dict = None) -> list:
+    """Plans the conversion of the fields of a structured NumPy dtype to Arrow columns.
+
+    Padding fields are dropped. Variable-length arrays become list columns holding only the elements in use, so their
+    _length fields are dropped too.
+
+    Returns:
+        List of (name, Arrow type, convert) where convert takes the field and the whole structured array.
+    """
+    enum_fields = enum_fields or dict()
+    columns = []
+    for name in dtype.names:
+        if name.startswith('_') or (name.endswith('_length') and name[:-len('_length')] in dtype.names):
+            continue
+        field_dtype = dtype[name]
+        if f'{name}_length' in dtype.names and field_dtype.subdtype:
+            arrow_type, convert = _variable_column(json_db, field_dtype, f'{name}_length')
+        else:
+            arrow_type, convert_field = _column(json_db, field_dtype, enum_fields.get(name))
+            convert = _field_converter(convert_field)
+        columns.append((name, arrow_type, convert))
+    return columns
+
+
+class _TableConverter:
+    """Converts read_batch arrays of one message definition to Arrow tables.
+    """
+
+    def __init__(self, json_db: jsonreader.JsonReader, message_id: int, message_crc: int):
+        import pyarrow as pa
+
+        self.name = json_db.message_names.get(message_id, str(message_id))
+        header_dtype = common.ctype_to_dtype(novatel.OEM4BinaryHeader)
+        self._header = [(name, arrow_type, convert) for name, arrow_type, convert in _columns(json_db, header_dtype)
+                        if name in HEADER_COLUMNS]
+        self._header.sort(key=lambda column: HEADER_COLUMNS.index(column[0]))
+
+        body_dtype = json_db.get_message_dtype(message_id, message_crc)
+        self._body = [(name if name not in HEADER_COLUMNS else f'body.{name}', arrow_type, convert)
+                      for name, arrow_type, convert in
+                      _columns(json_db, body_dtype, json_db.get_message_enum_fields(message_id, message_crc))]
+        self.schema = pa.schema(
+            [(name, arrow_type) for name, arrow_type, _ in self._header + self._body],
+            metadata={'message_name': self.name, 'message_id': str(message_id), 'message_crc': str(message_crc)})
+
+    def convert(self, messages: 'numpy.ndarray') -> 'pyarrow.Table':
+        import pyarrow as pa
+
+        arrays = []
+        for part, columns in (('header', self._header), ('body', self._body)):
+            values = messages[part]
+            for name, _, convert in columns:
+                arrays.append(convert(values[name.rpartition('.')[2]], values))
+        return pa.Table.from_arrays(arrays, schema=self.schema)
+
+
+def message_schema(json_db: jsonreader.JsonReader, message_id: int, message_crc: int) -> 'pyarrow.Schema':
+    """Gets the Arrow schema of a message definition. Requires NumPy and PyArrow.
+
+    Tables start with the HEADER_COLUMNS of the binary header, followed by the message fields. Fields that clash with
+    a header column are named 'body.field'. Enum fields are dictionary-encoded enumerator names, strings are UTF-8,
+    variable-length arrays are lists of only the elements in use and FIELD_ARRAY elements are structs.
+
+    Args:
+        json_db: JsonReader holding the message definition.
+        message_id: The message ID.
+        message_crc: The message definition CRC.
+
+    Returns:
+        The schema, with the message name, ID and CRC in its metadata.
+    """
+    return _TableConverter(json_db, message_id, message_crc).schema
+
+
+def to_table(json_db: jsonreader.JsonReader, message_id: int, message_crc: int,
+             messages: 'numpy.ndarray') -> 'pyarrow.Table':
+    """Converts a read_batch array of one message definition to an Arrow table. Requires NumPy and PyArrow.
+
+    Args:
+        json_db: JsonReader holding the message definition.
+        message_id: The message ID.
+        message_crc: The message definition CRC.
+        messages: Structured array with 'header' and 'body' fields as returned by read_batch.
+
+    Returns:
+        The table, with the schema of message_schema.
+    """
+    return _TableConverter(json_db, message_id, message_crc).convert(messages)
+
+
+class ParquetSink:
+    """Writes decoded messages to one Parquet file per message definition. Requires NumPy and PyArrow.
+
+    Messages are buffered as raw FLATTENED_BINARY records, one buffer per (message_id, message_crc), and converted to
+    Arrow a whole row group at a time. A message type's buffer is written out as soon as it holds row_group_size
+    messages. Whenever all buffers together exceed max_buffer_size bytes, the buffer holding the most bytes is written
+    out early, so memory use is bounded regardless of the size of the input.
+
+    Each message type is written to output_dir/NAME/CRC.parquet, so every message type is a Parquet dataset
+    directory holding one file per definition version.
+    """
+
+    def __init__(self, output_dir: str, json_db: Union[str, jsonreader.JsonReader] = None,
+                 row_group_size: int = PARQUET_ROW_GROUP_SIZE, max_buffer_size: int = PARQUET_BUFFER_SIZE,
+                 compression: str = 'zstd'):
+        """Initializer.
+
+        Args:
+            output_dir: Directory to write the Parquet files to. It is created if it does not exist.
+            json_db: JSON database path or JsonReader.
+            row_group_size: Number of messages per row group.
+            max_buffer_size: Maximum number of bytes of buffered messages across all message types.
+            compression: Parquet compression codec.
+        """
+        if row_group_size < 1:
+            raise ValueError(f'row_group_size must be positive, not {row_group_size}')
+
+        self.output_dir = output_dir
+        self._json_db = jsonreader.get_json_reader(json_db)
+        self.row_group_size = row_group_size
+        self.max_buffer_size = max_buffer_size
+        self.compression = compression
+        self.paths = dict()  # (message_id, message_crc) -> path of the Parquet file
+        self._converters = dict()
+        self._writers = dict()
+        self._buffers = dict()  # (message_id, message_crc) -> list of structured arrays
+        self._buffered_rows = dict()
+        self._buffered_bytes = dict()
+        self._buffered_size = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, meta_data: common.MetaDataStruct, message: novatel.Message):
+        """Buffers one decoded message, as returned by Parser.read with the FLATTENED_BINARY encode format.
+
+        Responses and messages without a decoded body are skipped.
+
+        Args:
+            meta_data: The message's meta data, which identifies its definition.
+            message: The decoded message.
+        """
+        import numpy as np
+
+        if not isinstance(message, novatel.Message) or message.body is None:
+            return
+        key = (meta_data.message_id, meta_data.message_crc)
+        dtype = np.dtype([('header', common.ctype_to_dtype(novatel.OEM4BinaryHeader)),
+                          ('body', self._json_db.get_message_dtype(*key))])
+        self._append(key, np.frombuffer(bytes(message.header) + bytes(message.body)[:dtype['body'].itemsize],
+                                        dtype=dtype))
+
+    def write_batch(self, batch: dict):
+        """Buffers a batch of messages as returned by read_batch.
+
+        Args:
+            batch: Dictionary mapping (message_id, message_crc) to a structured array with 'header' and 'body' fields.
+        """
+        for key, messages in batch.items():
+            if len(messages):
+                self._append(key, messages)
+
+    def write_parser(self, parser, batch_size: int = 4096) -> int:
+        """Reads every message from a parser with the FLATTENED_BINARY encode format and buffers it.
+
+        Frames the parser skips are counted in its batch_skipped. An IOError is raised if parsing stops on any status
+        other than the parser running out of data.
+
+        Args:
+            parser: Parser, FileParser or MappedFileParser to read batches from until it runs dry.
+            batch_size: Maximum number of messages read at a time.
+
+        Returns:
+            The number of messages read.
+        """
+        count = 0
+        while batch := parser.read_batch(batch_size):
+            self.write_batch(batch)
+            count += sum(len(messages) for messages in batch.values())
+        if parser.batch_status not in (common.STATUS.BUFFER_EMPTY, common.STATUS.STREAM_EMPTY):
+            raise IOError(f'Parsing stopped with status {parser.batch_status.name}')
+        return count
+
+    def _append(self, key: tuple, messages: 'numpy.ndarray'):
+        self._buffers.setdefault(key, []).append(messages)
+        self._buffered_rows[key] = self._buffered_rows.get(key, 0) + len(messages)
+        self._buffered_bytes[key] = self._buffered_bytes.get(key, 0) + messages.nbytes
+        self._buffered_size += messages.nbytes
+
+        if self._buffered_rows[key] >= self.row_group_size:
+            self._write_buffer(key, whole_row_groups=True)
+        while self._buffered_size > self.max_buffer_size:
+            self._write_buffer(max(self._buffers, key=self._buffered_bytes.get))
+
+    def _write_buffer(self, key: tuple, whole_row_groups: bool = False):
+        """Writes out the messages buffered for a message type.
+
+        Args:
+            key: The (message_id, message_crc) of the message type.
+            whole_row_groups: Only write full row groups and keep the remainder buffered.
+        """
+        import numpy as np
+
+        messages = self._buffers.pop(key)
+        messages = messages[0] if len(messages) == 1 else np.concatenate(messages)
+        self._buffered_rows.pop(key)
+        self._buffered_size -= self._buffered_bytes.pop(key)
+
+        end = len(messages) - len(messages) % self.row_group_size if whole_row_groups else len(messages)
+        if end < len(messages):
+            remainder = messages[end:].copy()
+            self._buffers[key] = [remainder]
+            self._buffered_rows[key] = len(remainder)
+            self._buffered_bytes[key] = remainder.nbytes
+            self._buffered_size += remainder.nbytes
+
+        writer = self._get_writer(key)
+        converter = self._converters[key]
+        for start in range(0, end, self.row_group_size):
+            writer.write_table(converter.convert(messages[start:min(start + self.row_group_size, end)]),
+                               row_group_size=self.row_group_size)
+
+    def _get_writer(self, key: tuple) -> 'pyarrow.parquet.ParquetWriter':
+        writer = self._writers.get(key)
+        if writer is None:
+            import pyarrow.parquet as pq
+
+            converter = self._converters[key] = _TableConverter(self._json_db, *key)
+            path = os.path.join(self.output_dir, converter.name, f'{key[1]}.parquet')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            writer = self._writers[key] = pq.ParquetWriter(path, converter.schema, compression=self.compression)
+            self.paths[key] = path
+        return writer
+
+    def flush(self):
+        """Writes out every buffered message.
+        """
+        for key in list(self._buffers):
+            self._write_buffer(key)
+
+    def close(self):
+        """Writes out every buffered message and closes the Parquet files.
+        """
+        self.flush()
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+def write_parquet(input_file: str, output_dir: str, json_db: Union[str, jsonreader.JsonReader] = None,
+                  message_names: Iterable[str] = None, **kwargs) -> dict:
+    """Decodes a file and writes its messages to one Parquet file per message definition. Requires NumPy and PyArrow.
+
+    Args:
+        input_file: File to decode.
+        output_dir: Directory to write the Parquet files to.
+        json_db: JSON database path or JsonReader.
+        message_names: Names of the messages to write. None writes all.
+        kwargs: Further arguments of ParquetSink.
+
+    Returns:
+        Dictionary mapping (message_id, message_crc) to the path of its Parquet file.
+    """
+    json_db = jsonreader.get_json_reader(json_db)
+    parser = novatel.MappedFileParser(json_db, common.ENCODEFORMAT.FLATTENED_BINARY, input_file)
+    for message_name in message_names or ():
+        parser.filter.include_message_name(message_name)
+
+    with ParquetSink(output_dir, json_db, **kwargs) as sink:
+        sink.write_parser(parser)
+    return sink.paths
@@ -13,12 +13,10 @@ import os
 import sys
 from ctypes import *
 
-if sys.platform == 'linux':
-    HWINTERFACE_DLL = cdll.LoadLibrary(os.path.abspath(os.path.join(
-        os.path.dirname(__file__), '../resources', 'libhwinterface_dynamic_library.so')))
-elif sys.platform == 'win32':
-    HWINTERFACE_DLL = CDLL(os.path.abspath(os.path.join(
-        os.path.dirname(__file__), '../resources', 'hwinterface_dynamic_library.dll')))
+from novatel_edie.common import NativeLibrary
+
+# Loaded on first use, see NativeLibrary.
+HWINTERFACE_DLL = NativeLibrary('libhwinterface_dynamic_library.so', 'hwinterface_dynamic_library.dll')
 
 
 class ReadData(Structure):
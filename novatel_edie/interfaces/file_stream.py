@@ -9,14 +9,15 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 
 Module Description: Holds the Python interface to EDIE's file stream interface.
 """
+import mmap
+
 from novatel_edie.interfaces.common import *
 
-HWINTERFACE_DLL.ifs_init.restype = c_void_p
-HWINTERFACE_DLL.ifs_init.argtypes = [c_char_p]
-HWINTERFACE_DLL.ifs_del.restype = None
-HWINTERFACE_DLL.ifs_del.argtypes = [c_void_p]
-HWINTERFACE_DLL.ifs_read.restype = None
-HWINTERFACE_DLL.ifs_read.argtypes = [c_void_p, c_void_p, c_char_p, c_ulong]
+HWINTERFACE_DLL.declare({
+    'ifs_init': (c_void_p, [c_char_p]),
+    'ifs_del': (None, [c_void_p]),
+    'ifs_read': (None, [c_void_p, c_void_p, c_char_p, c_ulong]),
+})
 
 
 class InputFileStream:
@@ -67,3 +68,111 @@ class InputFileStream:
         HWINTERFACE_DLL.ifs_read(self._ifs, byref(status), self._data_buf, read_size)
 
         return status, self._data_buf.raw[:read_size]
+
+
+class MemoryMappedFileStream:
+    """Class to handle file inputs through a read-only memory map.
+
+    Reads return memoryviews over the mapping rather than copies, so large regions of a file can be handed to a
+    parser without passing through an intermediate buffer. The mapping is private (copy-on-write) so that the views
+    can be passed to ctypes functions without ever modifying the file.
+    """
+
+    def __init__(self, input_filepath: str, window_size: int = None, sequential: bool = True):
+        """Maps the file into memory.
+
+        Args:
+            input_filepath: Filepath to read from.
+            window_size: Default number of bytes returned by read(). None returns the rest of the file.
+            sequential: Advise the kernel that the mapping will be read sequentially so it can read ahead
+                aggressively and drop pages behind the reader.
+        """
+        self._file = None
+        self._mmap = None
+
+        if not os.path.exists(input_filepath):
+            raise FileNotFoundError(f'Invalid path: {input_filepath}')
+
+        self._file = open(input_filepath, 'rb')
+        self._stream_length = os.fstat(self._file.fileno()).st_size
+        self._window_size = window_size
+        self._position = 0
+        self._view = memoryview(b'')
+
+        if self._stream_length:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            if sequential and hasattr(self._mmap, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+            self._view = memoryview(self._mmap)
+
+    def __del__(self):
+        """Unmaps and closes the file.
+        """
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Unmaps and closes the file. Views returned by read() must not be used afterwards.
+        """
+        if self._mmap is not None:
+            self._view.release()
+            self._view = memoryview(b'')
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # Views returned by read() are still alive; the mapping is released along with them.
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def stream_length(self) -> int:
+        return self._stream_length
+
+    @property
+    def window_size(self) -> int:
+        return self._window_size
+
+    @window_size.setter
+    def window_size(self, value: int):
+        self._window_size = value
+
+    def tell(self) -> int:
+        """Gets the offset of the next byte to be read.
+        """
+        return self._position
+
+    def seek(self, offset: int):
+        """Moves the read position.
+
+        Args:
+            offset: Byte offset from the start of the file. It is clamped to the file size.
+        """
+        self._position = min(max(offset, 0), self._stream_length)
+
+    def read(self, read_size: int = None) -> tuple:
+        """Reads data from the mapping without copying it.
+
+        Args:
+            read_size: Number of bytes to read. Defaults to the window size.
+
+        Returns:
+            Tuple where the first item is the stream status and the second item is a memoryview over the data. The
+            view is valid until the stream is closed.
+        """
+        read_size = read_size or self._window_size or self._stream_length
+        data = self._view[self._position:self._position + read_size]
+        self._position += len(data)
+
+        status = StreamReadStatus()
+        status.bytes_read = len(data)
+        status.stream_length = self._stream_length
+        status.percent_read = (100 * self._position // self._stream_length) if self._stream_length else 100
+        status.eos = self._position >= self._stream_length
+        return status, data
@@ -0,0 +1,134 @@
+"""
+Copyright 2023 NovAtel Inc.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+Module Description: Unit tests for the JSON database reader.
+"""
+import ctypes
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from novatel_edie.decoders import common, jsonreader
+
+
+# -------------------------------------------------------------------------------------------------------
+# JsonReader Unit Tests
+# -------------------------------------------------------------------------------------------------------
+class TestJsonReader(unittest.TestCase):
+    json_db = jsonreader.JsonReader()
+
+    def test_SHARED_JSON_READER(self):
+        jsonreader.evict_json_readers()
+        json_db = jsonreader.get_json_reader()
+        self.assertIs(json_db, jsonreader.get_json_reader(json_db.json_db_filepath))
+        self.assertIs(self.json_db, jsonreader.get_json_reader(self.json_db))
+
+        jsonreader.evict_json_readers(json_db.json_db_filepath)
+        self.assertIsNot(json_db, jsonreader.get_json_reader())
+
+    def test_PICKLE(self):
+        unpickled = pickle.loads(pickle.dumps(self.json_db))
+        self.assertEqual(self.json_db.json_db_filepath, unpickled.json_db_filepath)
+        self.assertEqual(len(self.json_db.enum_definitions), len(unpickled.enum_definitions))
+        message_crc = next(iter(self.json_db.message_definitions[42]))  # BESTPOS
+        self.assertEqual(ctypes.sizeof(self.json_db.get_message_definition_structure(42, message_crc)),
+                         ctypes.sizeof(unpickled.get_message_definition_structure(42, message_crc)))
+
+    def test_LAZY_MESSAGE_DEFINITIONS(self):
+        json_db = jsonreader.JsonReader()
+        message_crc = next(iter(json_db.message_definitions[42]))  # BESTPOS
+        self.assertIn(message_crc, json_db.message_definitions[42])
+        self.assertNotIn(0xFFFFFFFF, json_db.message_definitions[42])
+
+        structure = json_db.get_message_definition_structure(42, message_crc)
+        self.assertEqual(f'BESTPOS_42_{message_crc}', structure.__name__)
+        self.assertIs(structure, json_db.message_definitions[42][message_crc])
+        self.assertRaises(KeyError, json_db.get_message_definition_structure, 42, 0xFFFFFFFF)
+
+    def test_DEFINITIONS_CACHE(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            compiled = jsonreader.JsonReader(cache=cache_dir)
+            self.assertEqual(len(self.json_db.enum_definitions), len(compiled.enum_definitions))
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+            cached = jsonreader.JsonReader(cache=cache_dir)
+            for message_id, versions in self.json_db.message_definitions.items():
+                for message_crc, structure in versions.items():
+                    cached_structure = cached.get_message_definition_structure(message_id, message_crc)
+                    self.assertEqual(structure.__name__, cached_structure.__name__)
+                    self.assertEqual(ctypes.sizeof(structure), ctypes.sizeof(cached_structure))
+
+    def test_LOOKUP_INDEXES(self):
+        self.assertEqual(42, self.json_db.message_ids['BESTPOS'])
+        self.assertEqual('BESTPOS', self.json_db.message_names[42])
+        self.assertIn(self.json_db.latest_message_crcs[42], self.json_db.message_definitions[42])
+        self.assertTrue(self.json_db.get_latest_message_definition_structure('BESTPOS').__name__.startswith('BESTPOS_42_'))
+
+        for enum_name, enum_id in self.json_db.enum_ids.items():
+            enum = self.json_db.enum_definitions[enum_id]
+            self.assertEqual(enum_name, enum.__name__)
+            for value, name in self.json_db.enum_value_names[enum_id].items():
+                self.assertEqual(enum(value).name, name)
+
+    def test_MESSAGE_DTYPE_SIZES(self):
+        for message_id, versions in self.json_db.message_definitions.items():
+            for message_crc, structure in versions.items():
+                dtype = self.json_db.get_message_dtype(message_id, message_crc)
+                self.assertEqual(ctypes.sizeof(structure), dtype.itemsize, structure.__name__)
+
+    def test_MESSAGE_DTYPE_VIEW(self):
+        message_id = 42  # BESTPOS
+        message_crc = next(iter(self.json_db.message_definitions[message_id]))
+        structure = self.json_db.get_message_definition_structure(message_id, message_crc)
+
+        body = structure()
+        body.latitude = 51.15043699323
+        body.longitude = -114.03067932462
+        body.num_svs = 42
+        view = np.frombuffer(bytes(body), dtype=self.json_db.get_message_dtype(message_id, message_crc))
+
+        self.assertEqual(51.15043699323, view['latitude'][0])
+        self.assertEqual(-114.03067932462, view['longitude'][0])
+        self.assertEqual(42, view['num_svs'][0])
+
+    def test_DECODE_ENUM(self):
+        message_crc = self.json_db.latest_message_crcs[42]  # BESTPOS
+        enum_fields = self.json_db.get_message_enum_fields(42, message_crc)
+        self.assertIn('solution_status', enum_fields)
+
+        enum_id = enum_fields['solution_status']
+        value_names = self.json_db.enum_value_names[enum_id]
+        values = np.array(list(value_names) + [-12345], dtype=np.int32)
+        self.assertEqual(list(value_names.values()) + [None], list(self.json_db.decode_enum(enum_id, values)))
+
+        codes, names = self.json_db.decode_enum(enum_id, values, codes=True)
+        self.assertEqual(-1, codes[-1])
+        self.assertEqual(list(value_names.values()), list(names[codes[:-1]]))
+
+    def test_STRUCTURE_FLATTENER(self):
+        for versions in self.json_db.message_definitions.values():
+            for structure in versions.values():
+                flattener = common.StructureFlattener(structure)
+                self.assertEqual(len(flattener.row(structure())), len(list(flattener.rows([structure()]))[0]))
+
+        structure = self.json_db.get_latest_message_definition_structure('BESTPOS')
+        body = structure()
+        body.latitude = 51.15043699323
+        body.num_svs = 42
+        row = common.StructureFlattener(structure).row(body)
+        fields = [field_name for field_name, _ in structure._fields_]
+        self.assertEqual(51.15043699323, row[fields.index('latitude')])
+        self.assertEqual(body._fields_to_list(), row)
+
+
+if __name__ == "__main__":
+    unittest.main()
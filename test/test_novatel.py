@@ -10,9 +10,10 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 Module Description: Unit tests for NovAtel logs.
 """
 import os
+import tempfile
 import unittest
 
-from novatel_edie.decoders import common, jsonreader, novatel
+from novatel_edie.decoders import common, frame_index, jsonreader, novatel, parallel, parquet
 
 
 # -------------------------------------------------------------------------------------------------------
@@ -1112,6 +1113,44 @@ class TestFramer(unittest.TestCase):
         self.assertTrue(CompareMetaData(meta_data, expected_meta_data))
         self.framer.frame_json = False
 
+    # -------------------------------------------------------------------------------------------------------
+    # Zero-Copy Framer Unit Tests
+    # -------------------------------------------------------------------------------------------------------
+    def test_ZERO_COPY(self):
+        self.FlushFramer()
+
+        data = b'#BESTPOSA,COM1,0,83.5,FINESTEERING,2163,329760.000,02400000,b1f6,65535;SOL_COMPUTED,SINGLE,51.15043874397,-114.03066788586,1097.6822,-17.0000,WGS84,1.3648,1.1806,3.1112,\"\",0.000,0.000,18,18,18,0,00,02,11,01*c3194e35\r\n'
+        self.WriteBytesToFramer(data + data)
+
+        self.framer.zero_copy = True
+        status, frame, meta_data = self.framer.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        self.assertIsInstance(frame, memoryview)
+        self.assertEqual(data, frame)
+
+        detached = frame.tobytes()
+        status, frame, meta_data = self.framer.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        self.assertEqual(data, detached)
+        self.assertEqual(data, frame)
+        self.framer.zero_copy = False
+
+    def test_READ_MANY(self):
+        self.FlushFramer()
+
+        data = b'#BESTPOSA,COM1,0,83.5,FINESTEERING,2163,329760.000,02400000,b1f6,65535;SOL_COMPUTED,SINGLE,51.15043874397,-114.03066788586,1097.6822,-17.0000,WGS84,1.3648,1.1806,3.1112,\"\",0.000,0.000,18,18,18,0,00,02,11,01*c3194e35\r\n'
+        self.WriteBytesToFramer(b'GARBAGE_DATA' + data + data)
+
+        batch = self.framer.read_many(max_frames=8)
+        self.assertEqual(3, len(batch))
+        self.assertEqual([common.STATUS.UNKNOWN, common.STATUS.SUCCESS, common.STATUS.SUCCESS],
+                         [status for status, _, _ in batch])
+        self.assertEqual([0, 12, 12 + len(data)], list(batch.offsets[:len(batch)]))
+        self.assertEqual(b'GARBAGE_DATA' + data + data, batch.data)
+        self.assertEqual(data, batch.frame(2))
+        self.assertEqual(novatel.HeaderFormatEnum.ASCII.value, batch.meta_data[1].format)
+        self.assertEqual(0, len(self.framer.read_many()))
+
 
 # -------------------------------------------------------------------------------------------------------
 # Decoder/Encoder Unit Tests
@@ -1267,5 +1306,318 @@ class TestDecodeEncode(unittest.TestCase):
         self.assertEqual(status, common.STATUS.NO_DEFINITION)
 
 
+# -------------------------------------------------------------------------------------------------------
+# Parser Unit Tests
+# -------------------------------------------------------------------------------------------------------
+class TestParser(unittest.TestCase):
+    json_db = jsonreader.JsonReader()
+    bestpos_ascii = b'#BESTPOSA,COM1,0,60.5,FINESTEERING,2166,327153.000,02000000,b1f6,16248;SOL_COMPUTED,WAAS,51.15043699323,-114.03067932462,1096.9772,-17.0000,WGS84,0.6074,0.5792,0.9564,\"131\",7.000,0.000,42,34,34,28,00,0b,1f,37*47bbdc4f\r\n'
+    bestpos_binary = b'\xAA\x44\x12\x1C\x2A\x00\x00\x20\x48\x00\x00\x00\xA4\xB4\xAC\x07\xD8\x16\x6D\x08\x08\x40\x00\x02\xF6\xB1\x00\x80\x00\x00\x00\x00\x10\x00\x00\x00\xD7\x03\xB0\x4C\xE5\x8E\x49\x40\x52\xC4\x26\xD1\x72\x82\x5C\xC0\x29\xCB\x10\xC7\x7A\xA2\x90\x40\x33\x33\x87\xC1\x3D\x00\x00\x00\xFA\x7E\xBA\x3F\x3F\x57\x83\x3F\xA9\xA4\x0A\x40\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x16\x16\x16\x16\x00\x06\x39\x33\x23\xC4\x89\x7A'
+    trackstat_ascii = b'#TRACKSTATA,COM1,0,58.0,FINESTEERING,2166,318996.000,02000000,457c,16248;SOL_COMPUTED,WAAS,5.0,' \
+                      b'2,2,0,0810bc04,20999784.925,770.496,49.041,8473.355,0.228,GOOD,0.975,' \
+                      b'2,0,01303c0b,20999781.972,600.387,49.021,8466.896,0.000,OBSL2,0.000*14af539a\r\n'
+
+    def test_RECYCLE(self):
+        parser = novatel.Parser(self.json_db, recycle=True)
+        parser.write(self.bestpos_ascii + self.bestpos_ascii)
+
+        status, meta_data, message_data, _ = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        kept_meta_data = meta_data.snapshot()
+
+        status, next_meta_data, next_message_data, _ = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        self.assertIs(meta_data, next_meta_data)
+        self.assertIs(message_data, next_message_data)
+        self.assertIsNot(meta_data, kept_meta_data)
+        self.assertTrue(CompareMetaData(kept_meta_data, next_meta_data))
+        self.assertEqual(42, kept_meta_data.message_id)
+
+    def test_MESSAGE_FIELD_ACCESS(self):
+        parser = novatel.Parser(self.json_db, common.ENCODEFORMAT.FLATTENED_BINARY)
+        parser.write(self.bestpos_binary)
+        status, _, _, message = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+
+        self.assertAlmostEqual(51.11637266726, message.latitude)
+        self.assertEqual(message.body.num_svs, message['num_svs'])
+        self.assertEqual(1964, message.week)  # Falls back to the header.
+        self.assertRaises(AttributeError, getattr, message, 'not_a_field')
+        self.assertRaises(KeyError, message.__getitem__, 'not_a_field')
+        self.assertFalse(hasattr(message, '__dict__'))
+
+    def test_DETACH(self):
+        parser = novatel.Parser(self.json_db, common.ENCODEFORMAT.FLATTENED_BINARY)
+        arena = novatel.MessageArena()
+        parser.write(self.bestpos_binary)
+        status, _, message_data, message = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        encoded = message_data.message
+        detached = message.detach()
+        arena_detached = arena.detach(message)
+        detached_data = message_data.detach()
+
+        # The next message reuses the parser's buffer.
+        parser.write(self.bestpos_ascii)
+        status, _, _, message = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        self.assertAlmostEqual(51.15043699323, message.latitude)
+
+        self.assertAlmostEqual(51.11637266726, detached.latitude)
+        self.assertAlmostEqual(51.11637266726, arena_detached.latitude)
+        self.assertEqual(1964, detached.week)
+        self.assertEqual(encoded, detached_data.message)
+
+    def test_CONFIGURATION_MIRRORS_NATIVE_STATE(self):
+        parser = novatel.Parser(self.json_db, encode_format=common.ENCODEFORMAT.FLATTENED_BINARY)
+        self.assertEqual(common.ENCODEFORMAT.FLATTENED_BINARY, parser.encode_format)
+
+        parser.encode_format = common.ENCODEFORMAT.JSON
+        parser.decompress_rangecmp = not parser.decompress_rangecmp
+        parser.return_unknownbytes = not parser.return_unknownbytes
+        parser.ignore_abbrev_ascii_responses = not parser.ignore_abbrev_ascii_responses
+
+        self.assertEqual(common.ENCODEFORMAT.JSON, parser.encode_format)
+        self.assertEqual(parser.encode_format.value, common.DECODERS_DLL.novatel_parser_get_encodeformat(parser._parser))
+        self.assertEqual(parser.decompress_rangecmp,
+                         common.DECODERS_DLL.novatel_parser_get_decompress_rangecmp(parser._parser))
+        self.assertEqual(parser.return_unknownbytes,
+                         common.DECODERS_DLL.novatel_parser_get_return_unknownbytes(parser._parser))
+        self.assertEqual(parser.ignore_abbrev_ascii_responses,
+                         common.DECODERS_DLL.novatel_parser_get_ignore_abbrev_ascii_responses(parser._parser))
+
+    def test_READ_BATCH(self):
+        parser = novatel.Parser(self.json_db, encode_format=common.ENCODEFORMAT.FLATTENED_BINARY)
+        parser.write(self.bestpos_binary * 3)
+
+        batch = parser.read_batch()
+        self.assertEqual(1, len(batch))
+        (message_id, _), bestpos = next(iter(batch.items()))
+        self.assertEqual(42, message_id)
+        self.assertEqual(3, len(bestpos))
+        self.assertEqual([1964] * 3, bestpos['header']['week'].tolist())
+        self.assertEqual([51.11637266726] * 3, bestpos['body']['latitude'].tolist())
+        self.assertEqual(dict(), parser.batch_skipped)
+        self.assertEqual(common.STATUS.BUFFER_EMPTY, parser.batch_status)
+
+        parser.return_unknownbytes = True
+        parser.write(b'GARBAGE_DATA' + self.bestpos_binary)
+        (_, bestpos), = parser.read_batch().items()
+        self.assertEqual(1, len(bestpos))
+        self.assertIn(common.STATUS.UNKNOWN, parser.batch_skipped)
+        self.assertEqual(common.STATUS.BUFFER_EMPTY, parser.batch_status)
+
+        parser.encode_format = common.ENCODEFORMAT.ASCII
+        with self.assertRaises(ValueError):
+            parser.read_batch()
+
+    def test_STRUCTURE_FLATTENER_ARRAYS(self):
+        parser = novatel.Parser(self.json_db, encode_format=common.ENCODEFORMAT.FLATTENED_BINARY)
+        parser.write(self.trackstat_ascii * 3)
+        body = parser.read()[3].detach().body
+        flattener = common.StructureFlattener(type(body))
+
+        def leaves(values):
+            return [leaf for value in values for leaf in
+                    (leaves(value._fields_to_list()) if isinstance(value, common.BaseStructMixin) else [value])]
+
+        # Only the two channels in use are listed, on both paths.
+        row = flattener.row(body)
+        self.assertEqual(leaves(body._fields_to_list()), row)
+
+        (_, trackstats), = parser.read_batch().items()
+        self.assertEqual([row, row], list(flattener.rows(trackstats['body'])))
+
+    def test_EXPLODE(self):
+        parser = novatel.Parser(self.json_db, encode_format=common.ENCODEFORMAT.FLATTENED_BINARY)
+        parser.write(self.trackstat_ascii * 2)
+        messages = [parser.read()[3].detach() for _ in range(2)]
+        parser.write(self.trackstat_ascii * 2)
+        (_, trackstats), = parser.read_batch().items()
+
+        table = novatel.explode(trackstats)
+        for column in table.values():
+            self.assertEqual(4, len(column))
+        self.assertEqual([0, 0, 1, 1], table['message_index'].tolist())
+        self.assertEqual([2166] * 4, table['week'].tolist())
+        self.assertEqual([318996000] * 4, table['milliseconds'].tolist())
+
+        from_messages = novatel.explode(messages)
+        self.assertEqual(list(table), list(from_messages))
+        for name, column in table.items():
+            self.assertEqual(column.tolist(), from_messages[name].tolist())
+
+        with self.assertRaises(ValueError):
+            novatel.explode(trackstats, 'sol_status')
+
+    def test_PARQUET_SINK(self):
+        import pyarrow.parquet as pq
+
+        parser = novatel.Parser(self.json_db, encode_format=common.ENCODEFORMAT.FLATTENED_BINARY)
+        parser.write(self.bestpos_binary * 5)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with parquet.ParquetSink(temp_dir, self.json_db, row_group_size=2) as sink:
+                self.assertEqual(5, sink.write_parser(parser))
+            (message_id, message_crc), path = next(iter(sink.paths.items()))
+            self.assertEqual(42, message_id)
+            self.assertEqual(os.path.join(temp_dir, 'BESTPOS', f'{message_crc}.parquet'), path)
+
+            parquet_file = pq.ParquetFile(path)
+            self.assertEqual(3, parquet_file.metadata.num_row_groups)
+            self.assertEqual(parquet.message_schema(self.json_db, message_id, message_crc), parquet_file.schema_arrow)
+            table = parquet_file.read().to_pydict()
+        self.assertEqual([1964] * 5, table['week'])
+        self.assertEqual([51.11637266726] * 5, table['latitude'])
+        self.assertEqual(['SOL_COMPUTED'] * 5, table['solution_status'])
+
+    def test_PARQUET_SINK_ARRAYS(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        parser = novatel.Parser(self.json_db, encode_format=common.ENCODEFORMAT.FLATTENED_BINARY)
+        parser.write(self.trackstat_ascii * 3)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with parquet.ParquetSink(temp_dir, self.json_db) as sink:
+                _, meta_data, _, message = parser.read()
+                sink.write(meta_data, message)
+                self.assertEqual(2, sink.write_parser(parser))
+            path, = sink.paths.values()
+            table = pq.read_table(path)
+        self.assertEqual([2166] * 3, table['week'].to_pylist())
+
+        # The channel array is a list of structs holding only the two channels in use.
+        channels, = [field for field in table.schema if pa.types.is_list(field.type)]
+        self.assertTrue(pa.types.is_struct(channels.type.value_type))
+        self.assertEqual([2, 2, 2], [len(value) for value in table[channels.name].to_pylist()])
+
+        parser.write(self.trackstat_ascii)
+        (_, trackstats), = parser.read_batch().items()
+        exploded = novatel.explode(trackstats)
+        elements = table[channels.name].combine_chunks().flatten()
+        for element_field in channels.type.value_type:
+            if not pa.types.is_struct(element_field.type):
+                column = exploded.get(f'{channels.name}.{element_field.name}', exploded.get(element_field.name))
+                self.assertEqual(column.tolist() * 3, elements.field(element_field.name).to_pylist())
+
+
+class InputFileTestCase(unittest.TestCase):
+    """Base of the tests of components that read from a file in a temporary directory.
+    """
+    json_db = TestParser.json_db
+    bestpos_ascii = TestParser.bestpos_ascii
+    bestpos_binary = TestParser.bestpos_binary
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+    def write_input_file(self, data: bytes) -> str:
+        input_file = os.path.join(self.temp_dir, 'BESTPOS.GPS')
+        with open(input_file, 'wb') as output_file:
+            output_file.write(data)
+        return input_file
+
+
+class TestMappedFileParser(InputFileTestCase):
+    def test_MAPPED_FILE_PARSER(self):
+        input_file = self.write_input_file(self.bestpos_ascii * 3)
+
+        parser = novatel.MappedFileParser(self.json_db, input_file=input_file, window_size=64)
+        messages = [message_data.message for status, _, message_data, _ in parser
+                    if status == common.STATUS.SUCCESS]
+        self.assertEqual([self.bestpos_ascii] * 3, messages)
+        self.assertEqual(100, parser.percent_read)
+        self.assertEqual(common.STATUS.STREAM_EMPTY, parser.read()[0])
+
+        parser.reset()
+        status, _, message_data, _ = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        self.assertEqual(self.bestpos_ascii, message_data.message)
+
+    def test_MAPPED_FILE_PARSER_SEEK_TIME(self):
+        # Time-ordered: the binary log is from week 1964 and the ASCII log from week 2166.
+        input_file = self.write_input_file(self.bestpos_binary * 20 + self.bestpos_ascii * 20)
+
+        parser = novatel.MappedFileParser(self.json_db, input_file=input_file)
+        self.assertEqual(len(self.bestpos_binary) * 20, parser.seek_time(2000, 0))
+        status, _, message_data, _ = parser.read()
+        self.assertEqual(common.STATUS.SUCCESS, status)
+        self.assertEqual(self.bestpos_ascii, message_data.message)
+
+        self.assertEqual(0, parser.seek_time(1964, 0))
+        self.assertEqual(os.path.getsize(input_file), parser.seek_time(2200, 0))
+        self.assertEqual(common.STATUS.STREAM_EMPTY, parser.read()[0])
+
+
+class TestFrameIndex(InputFileTestCase):
+    def test_FRAME_INDEX(self):
+        input_file = self.write_input_file(self.bestpos_ascii + b'garbage' + self.bestpos_binary + self.bestpos_ascii)
+
+        index = frame_index.FrameIndex.open(input_file, self.json_db)
+        self.assertEqual(3, len(index))
+        self.assertTrue(os.path.exists(frame_index.FrameIndex.default_path(input_file)))
+        self.assertEqual(len(self.bestpos_ascii) + len(b'garbage'), index[1].offset)
+        self.assertEqual(len(self.bestpos_binary), index[1].length)
+        self.assertEqual(42, index[1].message_id)
+        self.assertEqual(1964, index[1].week)
+
+        loaded = frame_index.FrameIndex.open(input_file, self.json_db)
+        self.assertEqual(bytes(index.entries), bytes(loaded.entries))
+
+        selection = loaded.select(message_ids=[42], lower_week=1964, lower_second=0)
+        parser = novatel.MappedFileParser(self.json_db, input_file=input_file)
+        parser.select_frames(selection[1:2])
+        messages = [message_data.message for status, _, message_data, _ in parser
+                    if status == common.STATUS.SUCCESS]
+        self.assertEqual(1, len(messages))
+
+    def test_FRAME_INDEX_UNDECODED_HEADER(self):
+        nmea = b'$GPALM,30,01,01,2029,00,4310,7b,145f,fd44,a10ce4,1c5b11,0b399f,2bc421,f80,ffe*29\r\n'
+        input_file = self.write_input_file(self.bestpos_binary + nmea)
+
+        index = frame_index.FrameIndex.build(input_file, self.json_db)
+        self.assertEqual(2, len(index))
+        self.assertEqual(len(self.bestpos_binary), index[1].offset)
+        self.assertEqual(0, index[1].message_id)
+        self.assertEqual(0, index[1].week)
+        self.assertEqual(common.TIME_STATUS.UNKNOWN.value, index[1].time_status)
+        self.assertEqual(1, len(index.select(message_ids=[42])))
+
+    def test_SELECT_TIME_WINDOW(self):
+        times = [(1963, 604799000.0), (1964, 0.0), (1964, 600000000.0), (1965, 0.0)]
+        entries = (frame_index.FrameIndexEntry * len(times))()
+        for entry, (week, milliseconds) in zip(entries, times):
+            entry.message_id = 42
+            entry.week = week
+            entry.milliseconds = milliseconds
+        index = frame_index.FrameIndex(entries)
+
+        def selected_times(**kwargs):
+            return [(entry.week, entry.milliseconds) for entry in index.select(**kwargs)]
+
+        self.assertEqual(times[1:], selected_times(lower_week=1964))
+        self.assertEqual(times[:3], selected_times(upper_week=1964))
+        self.assertEqual(times[1:3], selected_times(lower_week=1964, upper_week=1964))
+        self.assertEqual(times[1:2], selected_times(lower_week=1964, upper_week=1964, upper_second=0))
+        self.assertEqual(times[2:], selected_times(lower_week=1964, lower_second=1))
+        with self.assertRaises(ValueError):
+            index.select(lower_second=0)
+
+
+class TestParallelFileParser(InputFileTestCase):
+    def test_PARALLEL_FILE_PARSER(self):
+        # Enough data for several shards, with shard boundaries falling inside messages.
+        input_file = self.write_input_file(self.bestpos_ascii * 400)
+
+        parser = parallel.ParallelFileParser(input_file, self.json_db, processes=2,
+                                             shard_size=common.MESSAGE_SIZE_MAX)
+        messages = [message for status, _, message, _ in parser if status == common.STATUS.SUCCESS]
+        self.assertEqual([self.bestpos_ascii] * 400, messages)
+
+        unordered = [message for status, _, message, _ in parser.map(ordered=False)]
+        self.assertEqual(400, len(unordered))
+
+
 if __name__ == "__main__":
     unittest.main()